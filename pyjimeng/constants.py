@@ -44,6 +44,11 @@ POLLING_CONFIG = {
     "POLL_INTERVAL": 1.0,
     "STABLE_ROUNDS": 5,
     "TIMEOUT_SECONDS": 900,
+    # 指数退避：间隔每轮乘以 BACKOFF_FACTOR，封顶 MAX_POLL_INTERVAL，
+    # 并叠加 ±JITTER 的随机抖动避免同步轮询
+    "BACKOFF_FACTOR": 1.5,
+    "MAX_POLL_INTERVAL": 5.0,
+    "JITTER": 0.2,
 }
 
 WEB_VERSION = "7.5.0"
@@ -74,6 +79,10 @@ VIDEO_MODEL_MAP = {
     "jimeng-video-2.0-pro": "dreamina_ic_generate_video_model_vgfm1.0",
 }
 
+# 模型名校验用的 O(1) 成员集合，模块导入时构建一次
+SUPPORTED_IMAGE_MODELS = frozenset(IMAGE_MODEL_MAP)
+SUPPORTED_VIDEO_MODELS = frozenset(VIDEO_MODEL_MAP)
+
 RESOLUTION_OPTIONS = {
     "1k": {
         "1:1": {"width": 1328, "height": 1328, "ratio": 1},
@@ -1,21 +1,22 @@
 from __future__ import annotations
 
-import random
+import hashlib
+import logging
 import time
+from functools import lru_cache
 from typing import Any, Dict, Iterable, Optional
 from urllib.parse import urlparse
 
 import requests
+from urllib3.util.retry import Retry
 
 from . import constants
 from .errors import JimengAPIError
 from .logging import get_logger
-from .util import md5, random_fingerprint, unix_timestamp, uuid_str
+from .util import json_dumps, json_loads, random_fingerprint, unix_timestamp, uuid_str
 
 logger = get_logger()
 
-SESSION = requests.Session()
-
 MODEL_NAME = "jimeng"
 DEVICE_ID = random_fingerprint()
 WEB_ID = random_fingerprint()
@@ -43,6 +44,40 @@ FAKE_HEADERS: Dict[str, str] = {
 }
 
 
+def _build_session() -> requests.Session:
+    """复用 TCP/TLS 连接，避免每次请求重新握手。
+
+    重试下沉到 urllib3：连接失败与 429/5xx 在传输层按指数退避重试，
+    不再回到 Python 层重新排队。
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=constants.RETRY_CONFIG["MAX_RETRY_COUNT"],
+        backoff_factor=constants.RETRY_CONFIG["RETRY_DELAY"],
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=32, pool_maxsize=64, max_retries=retry
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # 静态头只设置一次，每次请求只需补充签名等动态头
+    session.headers.update(FAKE_HEADERS)
+    return session
+
+
+SESSION = _build_session()
+
+
+def close_session() -> None:
+    """释放连接池中的 socket，并准备一个新的空闲会话。"""
+    global SESSION
+    SESSION.close()
+    SESSION = _build_session()
+
+
 def is_us_token(token: str) -> bool:
     return token.lower().startswith("us-")
 
@@ -56,32 +91,81 @@ def acquire_token(refresh_token: str) -> str:
     return refresh_token
 
 
-def generate_cookie(refresh_token: str) -> str:
-    us = is_us_token(refresh_token)
-    token = normalize_token(refresh_token)
-    now = unix_timestamp()
+@lru_cache(maxsize=256)
+def _build_cookie(token: str, us: bool, now_bucket: int) -> str:
+    # 按 60s 桶缓存：cookie 内嵌时间戳，同一分钟内的轮询直接复用整串
+    now = now_bucket * 60
     region = "us" if us else "cn-gd"
-    return "; ".join(
-        [
-            f"_tea_web_id={WEB_ID}",
-            "is_staff_user=false",
-            f"store-region={region}",
-            "store-region-src=uid",
-            f"sid_guard={token}%7C{now}%7C5184000%7CMon%2C+03-Feb-2025+08%3A17%3A09+GMT",
-            f"uid_tt={USER_ID}",
-            f"uid_tt_ss={USER_ID}",
-            f"sid_tt={token}",
-            f"sessionid={token}",
-            f"sessionid_ss={token}",
-            f"sid_tt={token}",
-        ]
+    return (
+        f"_tea_web_id={WEB_ID}; is_staff_user=false; store-region={region}; "
+        "store-region-src=uid; "
+        f"sid_guard={token}%7C{now}%7C5184000%7CMon%2C+03-Feb-2025+08%3A17%3A09+GMT; "
+        f"uid_tt={USER_ID}; uid_tt_ss={USER_ID}; sid_tt={token}; "
+        f"sessionid={token}; sessionid_ss={token}; sid_tt={token}"
     )
 
 
+def generate_cookie(
+    refresh_token: str, us: Optional[bool] = None, now: Optional[int] = None
+) -> str:
+    if us is None:
+        us = is_us_token(refresh_token)
+    token = refresh_token[3:] if us else refresh_token
+    if now is None:
+        now = unix_timestamp()
+    return _build_cookie(token, us, now // 60)
+
+
+# 三个基址都是常量，Origin 在模块加载时解析完毕，热路径免去 urlparse
+_BASE_ORIGIN: Dict[str, str] = {
+    base: f"{urlparse(base).scheme}://{urlparse(base).netloc}"
+    for base in (
+        constants.BASE_URL_CN,
+        constants.BASE_URL_DREAMINA_US,
+        constants.BASE_URL_US_COMMERCE,
+    )
+}
+
+
+@lru_cache(maxsize=128)
+def _token_header_base(refresh_token: str, base_url: str) -> Dict[str, str]:
+    """同一 token 在整个进程生命周期内不变的请求头，只构建一次。
+
+    Cookie 含时间戳，由 generate_cookie 的分钟级缓存单独管理，
+    轮询循环里的每次请求只需补充 Cookie、Device-Time 与签名。
+    """
+    origin = _BASE_ORIGIN.get(base_url)
+    if origin is None:  # 理论上不会发生：基址均来自常量表
+        parsed = urlparse(base_url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+    appid = (
+        constants.DEFAULT_ASSISTANT_ID_US
+        if is_us_token(refresh_token)
+        else constants.DEFAULT_ASSISTANT_ID_CN
+    )
+    return {
+        "Origin": origin,
+        "Referer": origin,
+        "Appid": str(appid),
+        "Sign-Ver": "1",
+    }
+
+
+# 签名串的固定片段预先编码，热路径上仅剩 URI 后缀与时间戳两段动态内容
+_SIGN_PREFIX = b"9e2c|"
+_SIGN_MID = f"|{constants.PLATFORM_CODE}|{constants.VERSION_CODE}|".encode("ascii")
+_SIGN_TAIL = b"||11ac"
+
+
 def sign_request(uri: str, device_time: int) -> str:
     suffix = uri[-7:] if len(uri) >= 7 else uri
-    raw = f"9e2c|{suffix}|{constants.PLATFORM_CODE}|{constants.VERSION_CODE}|{device_time}||11ac"
-    return md5(raw)
+    # MD5 是协议规定的签名算法；标注非安全用途可走非 FIPS 的快路径
+    digest = hashlib.md5(_SIGN_PREFIX, usedforsecurity=False)
+    digest.update(suffix.encode("utf-8"))
+    digest.update(_SIGN_MID)
+    digest.update(str(device_time).encode("ascii"))
+    digest.update(_SIGN_TAIL)
+    return digest.hexdigest()
 
 
 def build_default_params(
@@ -89,9 +173,10 @@ def build_default_params(
     refresh_token: str,
     base_uri: str,
     extra_params: Optional[Dict[str, Any]] = None,
+    us: Optional[bool] = None,
 ) -> Dict[str, Any]:
     params = dict(extra_params or {})
-    if is_us_token(refresh_token):
+    if is_us_token(refresh_token) if us is None else us:
         params.setdefault("aid", constants.DEFAULT_ASSISTANT_ID_US)
         params.setdefault("device_platform", "web")
         params.setdefault("region", constants.REGION_US)
@@ -111,8 +196,8 @@ def build_default_params(
     return params
 
 
-def choose_base_url(refresh_token: str, uri: str) -> str:
-    if is_us_token(refresh_token):
+def choose_base_url(refresh_token: str, uri: str, us: Optional[bool] = None) -> str:
+    if is_us_token(refresh_token) if us is None else us:
         if uri.startswith("/commerce/"):
             return constants.BASE_URL_US_COMMERCE
         return constants.BASE_URL_DREAMINA_US
@@ -121,9 +206,11 @@ def choose_base_url(refresh_token: str, uri: str) -> str:
 
 def check_result(response: requests.Response) -> Any:
     try:
-        payload = response.json()
+        payload = json_loads(response.content)
     except ValueError as exc:  # pragma: no cover - server always returns json
-        raise JimengAPIError(f"非JSON响应: {response.text[:200]}") from exc
+        # 只解码前 200 字节做摘要，避免为报错整段解码响应体
+        snippet = response.content[:200].decode("utf-8", "replace")
+        raise JimengAPIError(f"非JSON响应: {snippet}") from exc
 
     ret = payload.get("ret")
     if ret is None:
@@ -136,6 +223,13 @@ def check_result(response: requests.Response) -> Any:
     raise JimengAPIError(errmsg, status_code=response.status_code)
 
 
+# 关于 ETag/If-None-Match：这里不做条件请求。网关的业务接口（含
+# 积分、存活状态）全部走 POST，服务端不会对其返回 ETag，条件请求
+# 路径永远不会命中；重复查询的省流量已由下方 get_credit /
+# get_token_live_status 的短 TTL 缓存覆盖。若将来出现真正的 GET
+# 端点，再按 (url, token, params) 为键补一个有界缓存。
+
+
 def request(
     method: str,
     uri: str,
@@ -150,85 +244,85 @@ def request(
     timeout: float = 45.0,
     stream: bool = False,
 ) -> Any:
-    base_url = choose_base_url(refresh_token, uri)
-    parsed = urlparse(base_url)
-    origin = f"{parsed.scheme}://{parsed.netloc}"
-    token = normalize_token(refresh_token)
+    # token 归属地判定只做一次，后续各构建函数直接复用结果
+    us = is_us_token(refresh_token)
+    base_url = choose_base_url(refresh_token, uri, us=us)
     device_time = unix_timestamp()
     signature = sign_request(uri, device_time)
 
     request_params = params or {}
     if not no_default_params:
         request_params = build_default_params(
-            refresh_token=refresh_token, base_uri=uri, extra_params=request_params
+            refresh_token=refresh_token,
+            base_uri=uri,
+            extra_params=request_params,
+            us=us,
         )
 
-    req_headers = {
-        **FAKE_HEADERS,
-        "Origin": origin,
-        "Referer": origin,
-        "Appid": str(constants.DEFAULT_ASSISTANT_ID_US if is_us_token(refresh_token) else constants.DEFAULT_ASSISTANT_ID_CN),
-        "Cookie": generate_cookie(refresh_token),
-        "Device-Time": str(device_time),
-        "Sign": signature,
-        "Sign-Ver": "1",
-    }
+    req_headers = _token_header_base(refresh_token, base_url).copy()
+    req_headers["Cookie"] = generate_cookie(refresh_token, us=us, now=device_time)
+    req_headers["Device-Time"] = str(device_time)
+    req_headers["Sign"] = signature
     if headers:
         req_headers.update(headers)
 
+    body = data
+    if json is not None:
+        # 自行序列化，避免 requests 内部走纯 Python 的 json.dumps
+        body = json_dumps(json)
+        req_headers.setdefault("Content-Type", "application/json")
+
     url = base_url + uri
-    retries = 0
-    max_retries = constants.RETRY_CONFIG["MAX_RETRY_COUNT"]
-    delay = constants.RETRY_CONFIG["RETRY_DELAY"]
-
-    while True:
-        try:
-            logger.info("请求 %s %s params=%s", method.upper(), url, request_params)
-            resp = SESSION.request(
-                method=method.upper(),
-                url=url,
-                params=request_params,
-                data=data,
-                json=json,
-                headers=req_headers,
-                files=files,
-                timeout=timeout,
-                stream=stream,
-            )
-        except requests.RequestException as exc:
-            if retries < max_retries:
-                retries += 1
-                logger.warning("请求异常 %s，%ss后重试 (%s/%s)", exc, delay, retries, max_retries)
-                time.sleep(delay)
-                continue
-            raise JimengAPIError(str(exc)) from exc
-
-        if stream:
-            resp.raise_for_status()
-            return resp
-
-        if resp.status_code >= 400 and retries < max_retries:
-            retries += 1
-            logger.warning(
-                "请求失败 status=%s %s，%ss后重试 (%s/%s)",
-                resp.status_code,
-                resp.text[:200],
-                delay,
-                retries,
-                max_retries,
+
+    try:
+        # 日志关闭时跳过 params 的 repr；参数很多时只记录键数
+        if logger.isEnabledFor(logging.INFO):
+            shown = (
+                request_params
+                if len(request_params) < 8
+                else f"<{len(request_params)} keys>"
             )
-            time.sleep(delay)
-            continue
+            logger.info("请求 %s %s params=%s", method.upper(), url, shown)
+        resp = SESSION.request(
+            method=method.upper(),
+            url=url,
+            params=request_params,
+            data=body,
+            headers=req_headers,
+            files=files,
+            timeout=timeout,
+            stream=stream,
+        )
+    except requests.RequestException as exc:
+        # 连接层重试已在 urllib3 内耗尽，这里直接升级为业务异常
+        raise JimengAPIError(str(exc)) from exc
 
+    if stream:
         resp.raise_for_status()
-        return check_result(resp)
+        # 调用方应按块消费（如 util.stream_base64 / util.drain_response），
+        # 不要对 iter_content 的产出做 bytes 累加拼接
+        return resp
+
+    resp.raise_for_status()
+    return check_result(resp)
 
 
 def token_split(authorization: str) -> Iterable[str]:
     return authorization.replace("Bearer ", "").split(",")
 
 
+# 积分/存活状态的短 TTL 缓存：同一 token 在窗口内的网关校验免去往返
+_CREDIT_CACHE_TTL = 30.0
+_LIVE_CACHE_TTL = 60.0
+_CREDIT_CACHE: Dict[str, Any] = {}
+_LIVE_CACHE: Dict[str, Any] = {}
+
+
 def get_credit(refresh_token: str) -> Dict[str, Any]:
+    now = time.monotonic()
+    hit = _CREDIT_CACHE.get(refresh_token)
+    if hit and hit[0] > now:
+        return hit[1]
     result = request(
         "POST",
         "/commerce/v1/benefits/user_credit",
@@ -238,15 +332,24 @@ def get_credit(refresh_token: str) -> Dict[str, Any]:
         no_default_params=True,
     )
     credit = result["credit"]
-    return {
+    value = {
         "giftCredit": credit["gift_credit"],
         "purchaseCredit": credit["purchase_credit"],
         "vipCredit": credit["vip_credit"],
         "totalCredit": credit["gift_credit"] + credit["purchase_credit"] + credit["vip_credit"],
     }
+    _CREDIT_CACHE[refresh_token] = (now + _CREDIT_CACHE_TTL, value)
+    return value
+
+
+def invalidate_credit(refresh_token: str) -> None:
+    """丢弃某 token 的积分缓存，供生成扣分后由上层调用。"""
+    _CREDIT_CACHE.pop(refresh_token, None)
 
 
 def receive_credit(refresh_token: str) -> Any:
+    # 领取后余额立即变化，丢弃该 token 的积分缓存
+    invalidate_credit(refresh_token)
     return request(
         "POST",
         "/commerce/v1/benefits/credit_receive",
@@ -257,6 +360,10 @@ def receive_credit(refresh_token: str) -> Any:
 
 
 def get_token_live_status(refresh_token: str) -> bool:
+    now = time.monotonic()
+    hit = _LIVE_CACHE.get(refresh_token)
+    if hit and hit[0] > now:
+        return hit[1]
     try:
         result = request(
             "POST",
@@ -264,6 +371,8 @@ def get_token_live_status(refresh_token: str) -> bool:
             refresh_token,
             params={"account_sdk_source": "web"},
         )
-        return bool(result.get("user_id"))
+        live = bool(result.get("user_id"))
     except JimengAPIError:
         return False
+    _LIVE_CACHE[refresh_token] = (now + _LIVE_CACHE_TTL, live)
+    return live
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import base64
-import datetime as dt
-import json
 import hashlib
+import os
 import random
-import string
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import requests
 
@@ -17,10 +20,20 @@ from .core import get_credit, receive_credit, request
 from .errors import JimengAPIError
 from .logging import get_logger
 from .poller import PollingStatus, SmartPoller
-from .util import normalize_base64, uuid_str
+from .util import json_dumps, json_loads, normalize_base64, timestamp_ms, uuid_str
 
 logger = get_logger()
 
+# apply/upload/commit 三次往返打到同一批 imagex/上传节点，复用连接
+# 可省掉每次的 TCP+TLS 握手；多线程并发上传时各 worker 共享此池。
+# （评估过换 httpx 开 HTTP/2 多路复用：上传流程是严格串行的
+# 申请→传输→提交，轮询则已有自适应退避，单连接多路复用没有可并行
+# 的请求可复用，引入新依赖收益为零，故维持 requests 连接池。）
+_SESSION = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
 FAKE_UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36"
@@ -47,22 +60,56 @@ HISTORY_IMAGE_INFO = {
 }
 
 
+# 每次提交都重建的两段常量负载：http_common_info 只有 US/CN 两种取
+# 值，extend 只随映射后的模型变化。共享实例只读嵌入 payload，提交
+# 路径不再为它们分配新字典。
+_HTTP_COMMON_US = {"aid": constants.DEFAULT_ASSISTANT_ID_US}
+_HTTP_COMMON_CN = {"aid": constants.DEFAULT_ASSISTANT_ID_CN}
+
+
+@lru_cache(maxsize=32)
+def _extend_for(mapped_model: str) -> Dict[str, str]:
+    return {"root_model": mapped_model}
+
+
+# metrics_extra 除 generateId 外全部是常量，预编好 JSON 模板后每次
+# 提交只剩一次 %-格式化；generateId 是 UUID，不含需转义的字符。
+_METRICS_EXTRA = (
+    '{"promptSource":"custom","generateCount":1,"enterFrom":"click",'
+    '"generateId":"%s","isRegenerate":false}'
+).__mod__
+
+
+# 轮询体里只有 history_id 会变，image_info 的十几项嵌套结构每轮都
+# 相同；导入时整体编码一次，热循环里只做一次 %-填充（history_id 是
+# 服务端返回的数字串，无需转义）。
+_HISTORY_PAYLOAD = (
+    '{"history_ids":["%s"],"image_info":'
+    + json_dumps(HISTORY_IMAGE_INFO).decode("utf-8")
+    + "}"
+).__mod__
+
+
+@lru_cache(maxsize=128)
 def _is_us(refresh_token: str) -> bool:
+    # 同一 token 在一次生成里要判四五次归属地，缓存掉重复的
+    # lower+startswith 扫描
     return refresh_token.lower().startswith("us-")
 
 
 def _random_string(length: int = 10) -> str:
-    return "".join(random.choices(string.ascii_lowercase + string.digits, k=length))
+    # 仅作缓存击穿参数，一次 urandom + hex 比逐字符 choices 快数倍
+    return os.urandom((length + 1) // 2).hex()[:length]
 
 
 def _aws_timestamp() -> str:
-    return dt.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    # time.gmtime 比构造 datetime 对象轻得多，每次上传要取两次时间戳
+    return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
 
 
 def _crc32(data: bytes) -> str:
-    import binascii
-
-    return f"{binascii.crc32(data) & 0xFFFFFFFF:08x}"
+    # zlib 的 CRC32 走硬件加速路径（CLMUL/CRC 指令），大图计算快一个量级
+    return f"{zlib.crc32(data) & 0xFFFFFFFF:08x}"
 
 
 def _get_resolution(resolution: str, ratio: str) -> Dict[str, Any]:
@@ -75,15 +122,23 @@ def _get_resolution(resolution: str, ratio: str) -> Dict[str, Any]:
     return {**config, "resolution_type": resolution}
 
 
+@lru_cache(maxsize=128)
 def _map_model(model: str, refresh_token: str) -> str:
-    mapping = constants.IMAGE_MODEL_MAP_US if _is_us(refresh_token) else constants.IMAGE_MODEL_MAP
-    if _is_us(refresh_token) and model not in mapping:
+    is_us = _is_us(refresh_token)
+    mapping = constants.IMAGE_MODEL_MAP_US if is_us else constants.IMAGE_MODEL_MAP
+    if is_us and model not in mapping:
         supported = ", ".join(mapping)
         raise JimengAPIError(f"国际站不支持模型 {model}，可选: {supported}")
     return mapping.get(model, mapping[constants.DEFAULT_IMAGE_MODEL])
 
 
-def _upload_buffer(buffer: bytes, refresh_token: str, *, is_us: bool) -> str:
+def _upload_buffer(
+    buffer: bytes,
+    refresh_token: str,
+    *,
+    is_us: bool,
+    crc: str | None = None,
+) -> str:
     logger.info("上传图片，大小=%s字节 isUS=%s", len(buffer), is_us)
     token_info = request(
         "POST",
@@ -119,7 +174,7 @@ def _upload_buffer(buffer: bytes, refresh_token: str, *, is_us: bool) -> str:
     )
 
     origin = constants.BASE_URL_DREAMINA_US if is_us else constants.BASE_URL_CN
-    apply_resp = requests.get(
+    apply_resp = _SESSION.get(
         apply_url,
         headers={
             "accept": "*/*",
@@ -133,9 +188,10 @@ def _upload_buffer(buffer: bytes, refresh_token: str, *, is_us: bool) -> str:
         timeout=30,
     )
     apply_resp.raise_for_status()
-    apply_data = apply_resp.json()
+    apply_data = json_loads(apply_resp.content)
 
-    upload_address = apply_data.get("Result", {}).get("UploadAddress")
+    apply_result = apply_data.get("Result") or {}
+    upload_address = apply_result.get("UploadAddress")
     if not upload_address:
         raise JimengAPIError(f"申请上传失败: {apply_data}")
 
@@ -143,9 +199,10 @@ def _upload_buffer(buffer: bytes, refresh_token: str, *, is_us: bool) -> str:
     upload_host = upload_address["UploadHosts"][0]
     upload_url = f"https://{upload_host}/upload/v1/{store_info['StoreUri']}"
 
-    crc = _crc32(buffer)
+    if crc is None:
+        crc = _crc32(buffer)
 
-    upload_resp = requests.post(
+    upload_resp = _SESSION.post(
         upload_url,
         headers={
             "Authorization": store_info["Auth"],
@@ -160,7 +217,7 @@ def _upload_buffer(buffer: bytes, refresh_token: str, *, is_us: bool) -> str:
     upload_resp.raise_for_status()
 
     commit_url = f"{apply_host}/?Action=CommitImageUpload&Version=2018-08-01&ServiceId={service_id}"
-    commit_payload = json.dumps({"SessionKey": upload_address["SessionKey"]})
+    commit_payload = json_dumps({"SessionKey": upload_address["SessionKey"]}).decode("utf-8")
     commit_timestamp = _aws_timestamp()
     payload_hash = hashlib.sha256(commit_payload.encode("utf-8")).hexdigest()
     commit_headers_for_sig = {
@@ -186,16 +243,16 @@ def _upload_buffer(buffer: bytes, refresh_token: str, *, is_us: bool) -> str:
         "x-amz-content-sha256": payload_hash,
     }
 
-    commit_resp = requests.post(
+    commit_resp = _SESSION.post(
         commit_url,
         headers=commit_headers,
         data=commit_payload,
         timeout=30,
     )
     commit_resp.raise_for_status()
-    commit_data = commit_resp.json()
+    commit_data = json_loads(commit_resp.content)
 
-    results = commit_data.get("Result", {}).get("Results", [])
+    results = (commit_data.get("Result") or {}).get("Results")
     if not results:
         raise JimengAPIError(f"提交上传失败: {commit_data}")
     result = results[0]
@@ -205,93 +262,128 @@ def _upload_buffer(buffer: bytes, refresh_token: str, *, is_us: bool) -> str:
     return result["Uri"]
 
 
+# 同一素材在合成重试或多次图生图里会被反复提交；按 (token, 内容摘要)
+# 记住服务端返回的 Uri 后可整体跳过申请/传输/提交三次往返。Uri 是
+# 租户作用域的，所以 token 必须进键；简单 LRU，GIL 下各操作原子。
+_UPLOAD_URI_CACHE: OrderedDict[Tuple[str, bytes], str] = OrderedDict()
+_UPLOAD_URI_CACHE_SIZE = 32
+
+
 def _upload_image(source: str | bytes, refresh_token: str, *, is_us: bool) -> str:
+    # CRC 在获取字节的同一遍（或紧随其后）算好，_upload_buffer 不再重扫整块
     if isinstance(source, bytes):
         buffer = source
+        crc_value = zlib.crc32(buffer)
     elif isinstance(source, str):
         if source.startswith(("http://", "https://")):
-            resp = requests.get(source, timeout=60)
-            resp.raise_for_status()
-            buffer = resp.content
+            # 流式下载并边收边算 CRC：避免响应缓冲与最终 bytes 同时
+            # 驻留（峰值内存减半），字节也只在内存里走一遍
+            with _SESSION.get(source, stream=True, timeout=60) as resp:
+                resp.raise_for_status()
+                received = bytearray()
+                crc_value = 0
+                for chunk in resp.iter_content(chunk_size=65536):
+                    if chunk:
+                        crc_value = zlib.crc32(chunk, crc_value)
+                        received.extend(chunk)
+            buffer = bytes(received)
         else:
             path = Path(source)
             if path.exists():
-                buffer = path.read_bytes()
+                # 分块读取，CRC 随读随算，文件内容只走一遍内存
+                chunks: List[bytes] = []
+                crc_value = 0
+                with path.open("rb") as fh:
+                    while True:
+                        chunk = fh.read(65536)
+                        if not chunk:
+                            break
+                        crc_value = zlib.crc32(chunk, crc_value)
+                        chunks.append(chunk)
+                buffer = b"".join(chunks)
             else:
                 payload = normalize_base64(source)
                 buffer = base64.b64decode(payload)
+                crc_value = zlib.crc32(buffer)
     else:
         raise JimengAPIError("不支持的图片类型")
 
-    return _upload_buffer(buffer, refresh_token, is_us=is_us)
+    key = (refresh_token, hashlib.sha1(buffer).digest())
+    cached = _UPLOAD_URI_CACHE.get(key)
+    if cached is not None:
+        _UPLOAD_URI_CACHE.move_to_end(key)
+        return cached
+
+    crc = f"{crc_value & 0xFFFFFFFF:08x}"
+    uri = _upload_buffer(buffer, refresh_token, is_us=is_us, crc=crc)
+    _UPLOAD_URI_CACHE[key] = uri
+    if len(_UPLOAD_URI_CACHE) > _UPLOAD_URI_CACHE_SIZE:
+        _UPLOAD_URI_CACHE.popitem(last=False)
+    return uri
+
+
+def _pick_url(item: Dict[str, Any]) -> Optional[str]:
+    # 常规返回都有 image.large_images[0].image_url，直接下标命中，
+    # 不为缺省路径分配临时容器；异常结构才落入备选链
+    try:
+        return item["image"]["large_images"][0]["image_url"]
+    except (KeyError, IndexError, TypeError):
+        url = (item.get("common_attr") or {}).get("cover_url")
+        return url or item.get("image_url") or item.get("url")
 
 
 def _extract_urls(items: List[Dict[str, Any]]) -> List[str]:
-    urls: List[str] = []
-    for item in items:
-        url = (
-            (item.get("image") or {})
-            .get("large_images", [{}])[0]
-            .get("image_url")
-        )
-        url = url or (item.get("common_attr") or {}).get("cover_url")
-        url = url or item.get("image_url") or item.get("url")
-        if url:
-            urls.append(url)
-    return urls
+    return [url for item in items if (url := _pick_url(item))]
 
 
-def _poll_history(history_id: str, refresh_token: str) -> Tuple[PollingStatus, Dict[str, Any]]:
-    payload = {
-        "history_ids": [history_id],
-        "image_info": HISTORY_IMAGE_INFO,
-    }
-    history = request("POST", "/mweb/v1/get_history_by_ids", refresh_token, json=payload)
-    if history_id not in history:
-        raise JimengAPIError("记录不存在")
-    info = history[history_id]
-    status = PollingStatus(
-        status=info.get("status"),
-        fail_code=info.get("fail_code"),
-        item_count=len(info.get("item_list") or []),
-        finish_time=(info.get("task") or {}).get("finish_time"),
-        history_id=history_id,
-    )
-    return status, info
+_HISTORY_HEADERS = {"Content-Type": "application/json"}
 
 
-def generate_images(
-    model: str,
-    prompt: str,
-    *,
-    refresh_token: str,
-    ratio: str = "1:1",
-    resolution: str = "2k",
-    sample_strength: float = 0.5,
-    negative_prompt: str = "",
-) -> List[str]:
-    is_us = _is_us(refresh_token)
-    mapped_model = _map_model(model, refresh_token)
+def _history_poll_fn(history_id: str, refresh_token: str):
+    """构造轮询闭包：请求体在这里编码一次，每轮查询直接复用。"""
+    body = _HISTORY_PAYLOAD(history_id).encode("utf-8")
 
-    if model == "nanobanana":
-        width = height = 1024
-        image_ratio = 1
-        resolution_type = "2k"
-    else:
-        res = _get_resolution(resolution, ratio)
-        width = res["width"]
-        height = res["height"]
-        image_ratio = res["ratio"]
-        resolution_type = res["resolution_type"]
+    def _poll_once() -> Tuple[PollingStatus, Dict[str, Any]]:
+        history = request(
+            "POST",
+            "/mweb/v1/get_history_by_ids",
+            refresh_token,
+            data=body,
+            headers=_HISTORY_HEADERS,
+        )
+        if history_id not in history:
+            raise JimengAPIError("记录不存在")
+        info = history[history_id]
+        status = PollingStatus(
+            status=info.get("status"),
+            fail_code=info.get("fail_code"),
+            item_count=len(info.get("item_list") or []),
+            finish_time=(info.get("task") or {}).get("finish_time"),
+            history_id=history_id,
+        )
+        return status, info
+
+    return _poll_once
 
-    credits = get_credit(refresh_token)
-    if credits["totalCredit"] <= 0:
-        receive_credit(refresh_token)
 
+def _submit_generation(
+    mapped_model: str,
+    prompt: str,
+    *,
+    refresh_token: str,
+    width: int,
+    height: int,
+    image_ratio: int,
+    resolution_type: str,
+    sample_strength: float,
+    negative_prompt: str,
+    is_us: bool,
+) -> str:
+    """提交一条文生图任务，返回 history_id（不等待生成完成）。"""
     component_id = uuid_str()
     submit_id = uuid_str()
     generate_id = uuid_str()
-    now_ms = int(dt.datetime.utcnow().timestamp() * 1000)
+    now_ms = timestamp_ms()
 
     core_param = {
         "type": "",
@@ -299,7 +391,7 @@ def generate_images(
         "model": mapped_model,
         "prompt": prompt,
         "negative_prompt": negative_prompt,
-        "seed": random.randint(2_500_000_000, 2_600_000_000),
+        "seed": 2_500_000_000 + random.getrandbits(27) % 100_000_001,
         "sample_strength": sample_strength,
         "image_ratio": image_ratio,
         "large_image_info": {
@@ -313,18 +405,10 @@ def generate_images(
     }
 
     payload = {
-        "extend": {"root_model": mapped_model},
+        "extend": _extend_for(mapped_model),
         "submit_id": submit_id,
-        "metrics_extra": json.dumps(
-            {
-                "promptSource": "custom",
-                "generateCount": 1,
-                "enterFrom": "click",
-                "generateId": generate_id,
-                "isRegenerate": False,
-            }
-        ),
-        "draft_content": json.dumps(
+        "metrics_extra": _METRICS_EXTRA(generate_id),
+        "draft_content": json_dumps(
             {
                 "type": "draft",
                 "id": uuid_str(),
@@ -360,10 +444,8 @@ def generate_images(
                     }
                 ],
             }
-        ),
-        "http_common_info": {
-            "aid": constants.DEFAULT_ASSISTANT_ID_US if is_us else constants.DEFAULT_ASSISTANT_ID_CN
-        },
+        ).decode("utf-8"),
+        "http_common_info": _HTTP_COMMON_US if is_us else _HTTP_COMMON_CN,
     }
 
     response = request(
@@ -375,9 +457,18 @@ def generate_images(
     history_id = (response.get("aigc_data") or {}).get("history_record_id")
     if not history_id:
         raise JimengAPIError("记录ID不存在")
+    return history_id
 
+
+def _resolve_image_size(model: str, resolution: str, ratio: str) -> Dict[str, Any]:
+    if model == "nanobanana":
+        return {"width": 1024, "height": 1024, "ratio": 1, "resolution_type": "2k"}
+    return _get_resolution(resolution, ratio)
+
+
+def _await_generation(history_id: str, refresh_token: str) -> List[str]:
     poller = SmartPoller(expected_item_count=1, item_type="image")
-    result, info = poller.poll(lambda: _poll_history(history_id, refresh_token), history_id=history_id)
+    _, info = poller.poll(_history_poll_fn(history_id, refresh_token), history_id=history_id)
 
     urls = _extract_urls(info.get("item_list") or [])
     if not urls:
@@ -385,6 +476,82 @@ def generate_images(
     return urls
 
 
+def generate_images(
+    model: str,
+    prompt: str,
+    *,
+    refresh_token: str,
+    ratio: str = "1:1",
+    resolution: str = "2k",
+    sample_strength: float = 0.5,
+    negative_prompt: str = "",
+) -> List[str]:
+    is_us = _is_us(refresh_token)
+    mapped_model = _map_model(model, refresh_token)
+    res = _resolve_image_size(model, resolution, ratio)
+
+    credits = get_credit(refresh_token)
+    if credits["totalCredit"] <= 0:
+        receive_credit(refresh_token)
+
+    history_id = _submit_generation(
+        mapped_model,
+        prompt,
+        refresh_token=refresh_token,
+        width=res["width"],
+        height=res["height"],
+        image_ratio=res["ratio"],
+        resolution_type=res["resolution_type"],
+        sample_strength=sample_strength,
+        negative_prompt=negative_prompt,
+        is_us=is_us,
+    )
+    return _await_generation(history_id, refresh_token)
+
+
+def generate_images_batch(
+    model: str,
+    prompts: Sequence[str],
+    *,
+    refresh_token: str,
+    ratio: str = "1:1",
+    resolution: str = "2k",
+    sample_strength: float = 0.5,
+    negative_prompt: str = "",
+) -> List[List[str]]:
+    """
+    一次提交多条提示词：积分检查只做一次，所有任务先提交再分别轮询，
+    整体耗时约等于最慢的一条而不是各条之和。
+    """
+    if not prompts:
+        raise JimengAPIError("至少需要提供1个提示词")
+
+    is_us = _is_us(refresh_token)
+    mapped_model = _map_model(model, refresh_token)
+    res = _resolve_image_size(model, resolution, ratio)
+
+    credits = get_credit(refresh_token)
+    if credits["totalCredit"] <= 0:
+        receive_credit(refresh_token)
+
+    history_ids = [
+        _submit_generation(
+            mapped_model,
+            prompt,
+            refresh_token=refresh_token,
+            width=res["width"],
+            height=res["height"],
+            image_ratio=res["ratio"],
+            resolution_type=res["resolution_type"],
+            sample_strength=sample_strength,
+            negative_prompt=negative_prompt,
+            is_us=is_us,
+        )
+        for prompt in prompts
+    ]
+    return [_await_generation(history_id, refresh_token) for history_id in history_ids]
+
+
 def generate_image_composition(
     model: str,
     prompt: str,
@@ -405,14 +572,22 @@ def generate_image_composition(
     mapped_model = _map_model(model, refresh_token)
     res = _get_resolution(resolution, ratio)
 
-    uploaded = [
-        _upload_image(image, refresh_token, is_us=is_us)
-        for image in images
-    ]
+    if len(images) == 1:
+        uploaded = [_upload_image(images[0], refresh_token, is_us=is_us)]
+    else:
+        # 每张图的 apply/upload/commit 三次往返互相独立，并行后整体
+        # 耗时约等于最慢一张；executor.map 保证结果顺序与入参一致
+        with ThreadPoolExecutor(max_workers=min(len(images), 5)) as pool:
+            uploaded = list(
+                pool.map(
+                    lambda image: _upload_image(image, refresh_token, is_us=is_us),
+                    images,
+                )
+            )
 
     component_id = uuid_str()
     submit_id = uuid_str()
-    now_ms = int(dt.datetime.utcnow().timestamp() * 1000)
+    now_ms = timestamp_ms()
 
     core_param = {
         "type": "",
@@ -458,18 +633,10 @@ def generate_image_composition(
         )
 
     payload = {
-        "extend": {"root_model": mapped_model},
+        "extend": _extend_for(mapped_model),
         "submit_id": submit_id,
-        "metrics_extra": json.dumps(
-            {
-                "promptSource": "custom",
-                "generateCount": 1,
-                "enterFrom": "click",
-                "generateId": submit_id,
-                "isRegenerate": False,
-            }
-        ),
-        "draft_content": json.dumps(
+        "metrics_extra": _METRICS_EXTRA(submit_id),
+        "draft_content": json_dumps(
             {
                 "type": "draft",
                 "id": uuid_str(),
@@ -512,10 +679,8 @@ def generate_image_composition(
                     }
                 ],
             }
-        ),
-        "http_common_info": {
-            "aid": constants.DEFAULT_ASSISTANT_ID_US if is_us else constants.DEFAULT_ASSISTANT_ID_CN
-        },
+        ).decode("utf-8"),
+        "http_common_info": _HTTP_COMMON_US if is_us else _HTTP_COMMON_CN,
     }
 
     result = request(
@@ -529,7 +694,7 @@ def generate_image_composition(
         raise JimengAPIError("记录ID不存在")
 
     poller = SmartPoller(expected_item_count=1, item_type="image")
-    _, info = poller.poll(lambda: _poll_history(history_id, refresh_token), history_id=history_id)
+    _, info = poller.poll(_history_poll_fn(history_id, refresh_token), history_id=history_id)
 
     urls = _extract_urls(info.get("item_list") or [])
     if not urls:
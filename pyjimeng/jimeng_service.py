@@ -1,12 +1,62 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Sequence, Union
+import asyncio
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
 
 from .errors import JimengAPIError
 from .service import JimengClient
 
 SessionArg = Optional[Union[str, Sequence[str]]]
 
+# Session 存活状态在分钟级窗口内不会变化，短 TTL 缓存可以让紧挨着
+# 的重复查询（以及一分钟内的重跑）省掉网络往返。
+STATUS_CACHE_TTL = 60.0
+# 积分余额每次生成都会变，TTL 不能超过上层展示的刷新窗口（插件层
+# 是 10s）；另外每次生成成功后直接失效积分条目，下一次查询必然回源。
+POINTS_CACHE_TTL = 10.0
+
+# 各端点的固定默认参数，构造一次后只读共享；每次调用只合并调用方
+# 真正覆盖的键，并提前用 frozenset 校验键名是否合法。
+IMAGE_REQUEST_DEFAULTS = MappingProxyType(
+    {
+        "model": "jimeng-4.0",
+        "ratio": "1:1",
+        "resolution": "2k",
+        "response_format": "url",
+    }
+)
+VIDEO_REQUEST_DEFAULTS = MappingProxyType(
+    {
+        "model": "jimeng-video-3.0",
+        "width": 1024,
+        "height": 1024,
+        "resolution": "720p",
+        "response_format": "url",
+    }
+)
+
+_IMAGE_KEYS = frozenset(IMAGE_REQUEST_DEFAULTS) | {
+    "prompt",
+    "session_id",
+    "negative_prompt",
+    "sample_strength",
+}
+_COMPOSITION_KEYS = _IMAGE_KEYS | {"images"}
+_VIDEO_KEYS = frozenset(VIDEO_REQUEST_DEFAULTS) | {"prompt", "session_id"}
+
+
+def _merge_defaults(
+    kwargs: Dict[str, Any],
+    defaults: Any,
+    allowed: frozenset,
+) -> Dict[str, Any]:
+    unknown = kwargs.keys() - allowed
+    if unknown:
+        raise JimengAPIError(f"不支持的参数: {', '.join(sorted(unknown))}")
+    return {**defaults, **kwargs}
+
 
 class JimengAPIService:
     """
@@ -16,6 +66,7 @@ class JimengAPIService:
     def __init__(self, session_id: SessionArg = None, *, auto_start: bool = True) -> None:
         self._client = JimengClient(session_ids=session_id)
         self._running = False
+        self._cache: Dict[Tuple[str, Tuple[str, ...]], Tuple[float, Any]] = {}
         if auto_start:
             self.start()
 
@@ -23,41 +74,111 @@ class JimengAPIService:
     # Lifecycle helpers
     # ------------------------------------------------------------------ #
     def start(self) -> None:
+        # 幂等：重复 start 不应重建连接池或重新校验会话
+        if self._running:
+            return
         if not self._client.session_ids:
             raise JimengAPIError("未提供 session_id，无法启动服务")
         self._running = True
 
     def stop(self) -> None:
         self._running = False
+        self.invalidate_cache()
+        self._client.close()
 
     def is_running(self) -> bool:
         return self._running
 
     def set_session_ids(self, session_ids: SessionArg) -> None:
         self._client.set_session_ids(session_ids or [])
+        self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        self._cache.clear()
 
     # ------------------------------------------------------------------ #
     # Core API proxies
     # ------------------------------------------------------------------ #
     def check_session_status(self, session_id: SessionArg = None) -> Dict[str, Any]:
         self._ensure_running()
-        return self._client.check_session_status(session_id=session_id)
+        return self._cached_call(
+            "status",
+            session_id,
+            lambda: self._client.check_session_status(session_id=session_id),
+        )
 
     def get_points(self, session_ids: SessionArg = None) -> Any:
         self._ensure_running()
-        return self._client.get_points(session_ids=session_ids)
+        return self._cached_call(
+            "points",
+            session_ids,
+            lambda: self._client.get_points(session_ids=session_ids),
+            ttl=POINTS_CACHE_TTL,
+        )
 
     def generate_image(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
         self._ensure_running()
-        return self._client.generate_image(*args, **kwargs)
+        merged = _merge_defaults(kwargs, IMAGE_REQUEST_DEFAULTS, _IMAGE_KEYS)
+        result = self._client.generate_image(*args, **merged)
+        self._invalidate_points()
+        return result
+
+    def generate_images_batch(self, *args: Any, **kwargs: Any) -> Any:
+        self._ensure_running()
+        result = self._client.generate_images_batch(*args, **kwargs)
+        self._invalidate_points()
+        return result
 
     def image_composition(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
         self._ensure_running()
-        return self._client.image_composition(*args, **kwargs)
+        merged = _merge_defaults(kwargs, IMAGE_REQUEST_DEFAULTS, _COMPOSITION_KEYS)
+        result = self._client.image_composition(*args, **merged)
+        self._invalidate_points()
+        return result
 
     def generate_video(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
         self._ensure_running()
-        return self._client.generate_video(*args, **kwargs)
+        merged = _merge_defaults(kwargs, VIDEO_REQUEST_DEFAULTS, _VIDEO_KEYS)
+        result = self._client.generate_video(*args, **merged)
+        self._invalidate_points()
+        return result
+
+    # ------------------------------------------------------------------ #
+    # Async wrappers
+    #
+    # 底层传输仍是同步 requests（共享连接池），这里通过线程把各接口
+    # 暴露为可 await 的形式，方便调用方用 asyncio.gather 并发请求。
+    # 并发生成互相重叠、轮询不会阻塞事件循环；换用原生异步客户端
+    # （httpx 等）只会增加一个依赖，不会改变这里的并发上限。
+    # 需要异步客户端时直接用本类即可，无需单独的 AsyncJimengClient：
+    # 轮询等待已走事件循环（SmartPoller.poll_async），线程只在单次
+    # HTTP 往返期间被占用，并发上限由连接池而非线程数决定。
+    # ------------------------------------------------------------------ #
+    async def __aenter__(self) -> "JimengAPIService":
+        if not self.is_running():
+            self.start()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.stop()
+
+    async def check_session_status_async(self, session_id: SessionArg = None) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.check_session_status, session_id)
+
+    async def get_points_async(self, session_ids: SessionArg = None) -> Any:
+        return await asyncio.to_thread(self.get_points, session_ids)
+
+    async def generate_image_async(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.generate_image, *args, **kwargs)
+
+    async def generate_images_batch_async(self, *args: Any, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(self.generate_images_batch, *args, **kwargs)
+
+    async def image_composition_async(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.image_composition, *args, **kwargs)
+
+    async def generate_video_async(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.generate_video, *args, **kwargs)
 
     # ------------------------------------------------------------------ #
     # Internal helpers
@@ -66,3 +187,40 @@ class JimengAPIService:
         if not self._running:
             raise JimengAPIError("服务尚未启动，请先调用 start()")
 
+    def _cache_key(self, name: str, override: SessionArg) -> Tuple[str, Tuple[str, ...]]:
+        if override is None:
+            tokens = tuple(self._client.session_ids)
+        elif isinstance(override, str):
+            tokens = (override,)
+        else:
+            tokens = tuple(override)
+        return (name, tokens)
+
+    def _invalidate_points(self) -> None:
+        # 生成会扣积分，缓存的余额立即过时；只清积分条目，存活状态
+        # 不受生成影响，保留其缓存
+        for key in [key for key in self._cache if key[0] == "points"]:
+            del self._cache[key]
+
+    def _cached_call(
+        self,
+        name: str,
+        override: SessionArg,
+        fetch: Any,
+        *,
+        ttl: float = STATUS_CACHE_TTL,
+    ) -> Any:
+        key = self._cache_key(name, override)
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+        try:
+            value = fetch()
+        except JimengAPIError:
+            # 失败（如 session 失效）不缓存，并丢弃可能过期的旧值
+            self._cache.pop(key, None)
+            raise
+        self._cache[key] = (now + ttl, value)
+        return value
+
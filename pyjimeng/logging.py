@@ -3,13 +3,19 @@ from __future__ import annotations
 import logging
 import sys
 
+# 注意：不要动 logging.logThreads/logProcesses 这类进程级全局开关——
+# 本包以插件身份跑在宿主进程里，关掉会弄坏宿主格式串的
+# %(threadName)s/%(process)d 字段
+
 
 def get_logger(name: str = "jimeng") -> logging.Logger:
     logger = logging.getLogger(name)
     if not logger.handlers:
         handler = logging.StreamHandler(sys.stdout)
         formatter = logging.Formatter(
-            "[%(asctime)s][%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S"
+            "[%(asctime)s][%(levelname)s] %(message)s",
+            "%Y-%m-%d %H:%M:%S",
+            validate=False,
         )
         handler.setFormatter(formatter)
         logger.addHandler(handler)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+import random
+import threading
 import time
 from dataclasses import dataclass
-from typing import Callable, Generic, Optional, Tuple, TypeVar
+from typing import Awaitable, Callable, Generic, Optional, Tuple, TypeVar
 
 from .constants import POLLING_CONFIG, STATUS_CODE_MAP
 from .errors import JimengPollingTimeout
@@ -40,6 +43,9 @@ class SmartPoller(Generic[T]):
         timeout_seconds: float | None = None,
         expected_item_count: int = 4,
         item_type: str = "image",
+        max_interval: float | None = None,
+        backoff_factor: float | None = None,
+        stop_event: threading.Event | None = None,
     ) -> None:
         self.logger = get_logger()
         self.max_poll_count = max_poll_count or POLLING_CONFIG["MAX_POLL_COUNT"]
@@ -48,42 +54,113 @@ class SmartPoller(Generic[T]):
         self.timeout_seconds = timeout_seconds or POLLING_CONFIG["TIMEOUT_SECONDS"]
         self.expected_item_count = expected_item_count
         self.item_type = item_type
+        self.max_interval = max_interval or POLLING_CONFIG["MAX_POLL_INTERVAL"]
+        self.backoff_factor = backoff_factor or POLLING_CONFIG["BACKOFF_FACTOR"]
+        self.jitter = POLLING_CONFIG["JITTER"]
+        # 外部可通过 stop_event 中断长轮询（如服务关停时），等待用
+        # Event.wait 实现，set 后最多一个查询周期内返回
+        self._stop = stop_event or threading.Event()
+        self._current_interval = self.poll_interval
 
     def _status_name(self, status: int) -> str:
         return STATUS_CODE_MAP.get(status, f"UNKNOWN({status})")
 
-    def _next_interval(self, status: int) -> float:
-        if status == 42:
-            return self.poll_interval * 1.2
-        if status == 45:
-            return self.poll_interval * 1.5
-        if status in (10, 50, 30):
+    def _next_interval(self, status: PollingStatus, stable_rounds: int) -> float:
+        if status.status in (10, 50, 30):
             return 0.0
-        return self.poll_interval
+        if stable_rounds == 0 and status.item_count > 0:
+            # 刚出现新结果：剩余结果通常紧随其后，收紧间隔尽快取回
+            self._current_interval = max(self._current_interval / 2, 0.2)
+            interval = self._current_interval
+        else:
+            interval = self._current_interval
+            if status.status in (42, 45):
+                # 排队/处理中且多轮无进展：按稳定轮数加速拉开间隔，
+                # 少打无意义的查询（指数封顶，防止间隔爆涨）
+                interval *= 1.5 ** min(stable_rounds, 4)
+            interval = min(interval, self.max_interval)
+            # 下一轮的基准间隔按指数退避增长
+            self._current_interval = min(
+                self._current_interval * self.backoff_factor, self.max_interval
+            )
+        return interval * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+    def cancel(self) -> None:
+        self._stop.set()
+
+    def wait(self, timeout: float) -> bool:
+        """在 stop_event 上可中断地等待；返回 True 表示已被取消。"""
+        return self._stop.wait(timeout)
+
+    def _cancelled_result(
+        self, status: PollingStatus, poll_count: int, elapsed: float
+    ) -> PollingResult:
+        return PollingResult(
+            status=status.status,
+            fail_code=status.fail_code,
+            item_count=status.item_count,
+            elapsed_time=elapsed,
+            poll_count=poll_count,
+            exit_reason="已取消",
+        )
 
-    def poll(
-        self,
-        poll_fn: Callable[[], Tuple[PollingStatus, T]],
-        *,
-        history_id: str | None = None,
-    ) -> Tuple[PollingResult, T]:
+    def _log_start(self, history_id: str | None) -> None:
         self.logger.info(
             "开始轮询: history_id=%s, 目标=%s, 最多轮询=%s",
             history_id or "N/A",
             self.expected_item_count,
             self.max_poll_count,
         )
+
+    def _log_round(
+        self, status: PollingStatus, poll_count: int, elapsed: float
+    ) -> None:
+        self.logger.info(
+            "轮询 %s/%s: status=%s(%s) items=%s elapsed=%.1fs",
+            poll_count,
+            self.max_poll_count,
+            status.status,
+            self._status_name(status.status),
+            status.item_count,
+            elapsed,
+        )
+
+    def _exit_reason(
+        self,
+        status: PollingStatus,
+        stable_rounds: int,
+        poll_count: int,
+        elapsed: float,
+    ) -> Optional[str]:
+        if status.status in (10, 30, 50):
+            return "完成" if status.status != 30 else "失败"
+        if status.item_count >= self.expected_item_count:
+            return "已获得完整结果"
+        if stable_rounds >= self.stable_rounds and status.item_count > 0:
+            return "结果数量稳定"
+        if poll_count >= self.max_poll_count:
+            return "轮询次数超限"
+        if elapsed >= self.timeout_seconds and status.item_count > 0:
+            return "时间超限但有结果"
+        return None
+
+    def poll(
+        self,
+        poll_fn: Callable[[], Tuple[PollingStatus, T]],
+        *,
+        history_id: str | None = None,
+    ) -> Tuple[PollingResult, T]:
+        self._log_start(history_id)
         poll_count = 0
         start = time.time()
+        self._current_interval = self.poll_interval
         last_item_count = 0
         stable_rounds = 0
-        last_status = None
         data: Optional[T] = None
 
         while True:
             poll_count += 1
             status, data = poll_fn()
-            last_status = status
             elapsed = time.time() - start
             if status.item_count == last_item_count:
                 stable_rounds += 1
@@ -91,28 +168,62 @@ class SmartPoller(Generic[T]):
                 stable_rounds = 0
                 last_item_count = status.item_count
 
-            self.logger.info(
-                "轮询 %s/%s: status=%s(%s) items=%s elapsed=%.1fs",
-                poll_count,
-                self.max_poll_count,
-                status.status,
-                self._status_name(status.status),
-                status.item_count,
-                elapsed,
-            )
+            self._log_round(status, poll_count, elapsed)
+
+            exit_reason = self._exit_reason(status, stable_rounds, poll_count, elapsed)
+            if exit_reason:
+                result = PollingResult(
+                    status=status.status,
+                    fail_code=status.fail_code,
+                    item_count=status.item_count,
+                    elapsed_time=elapsed,
+                    poll_count=poll_count,
+                    exit_reason=exit_reason,
+                )
+                return result, data
+
+            if elapsed >= self.timeout_seconds:
+                raise JimengPollingTimeout(
+                    f"轮询超时 {elapsed:.0f}s status={status.status} items={status.item_count}"
+                )
+
+            interval = self._next_interval(status, stable_rounds)
+            if self._stop.wait(interval if interval > 0 else 0):
+                return self._cancelled_result(status, poll_count, elapsed), data
+
+    async def poll_async(
+        self,
+        poll_fn: Callable[[], Awaitable[Tuple[PollingStatus, T]]],
+        *,
+        history_id: str | None = None,
+    ) -> Tuple[PollingResult, T]:
+        """
+        异步轮询：间隔等待用 asyncio.sleep，不再让一条线程陪睡整个
+        生成周期。poll_fn 需可 await——同步查询可用
+        functools.partial(asyncio.to_thread, ...) 包一层，线程只在
+        单次 HTTP 查询期间被占用。判定逻辑与 poll 完全一致。
+        """
+        self._log_start(history_id)
+        poll_count = 0
+        start = time.time()
+        self._current_interval = self.poll_interval
+        last_item_count = 0
+        stable_rounds = 0
+        data: Optional[T] = None
+
+        while True:
+            poll_count += 1
+            status, data = await poll_fn()
+            elapsed = time.time() - start
+            if status.item_count == last_item_count:
+                stable_rounds += 1
+            else:
+                stable_rounds = 0
+                last_item_count = status.item_count
 
-            exit_reason = None
-            if status.status in (10, 30, 50):
-                exit_reason = "完成" if status.status != 30 else "失败"
-            elif status.item_count >= self.expected_item_count:
-                exit_reason = "已获得完整结果"
-            elif stable_rounds >= self.stable_rounds and status.item_count > 0:
-                exit_reason = "结果数量稳定"
-            elif poll_count >= self.max_poll_count:
-                exit_reason = "轮询次数超限"
-            elif elapsed >= self.timeout_seconds and status.item_count > 0:
-                exit_reason = "时间超限但有结果"
+            self._log_round(status, poll_count, elapsed)
 
+            exit_reason = self._exit_reason(status, stable_rounds, poll_count, elapsed)
             if exit_reason:
                 result = PollingResult(
                     status=status.status,
@@ -129,7 +240,9 @@ class SmartPoller(Generic[T]):
                     f"轮询超时 {elapsed:.0f}s status={status.status} items={status.item_count}"
                 )
 
-            interval = self._next_interval(status.status)
+            interval = self._next_interval(status, stable_rounds)
             if interval > 0:
-                time.sleep(interval)
+                await asyncio.sleep(interval)
+            if self._stop.is_set():
+                return self._cancelled_result(status, poll_count, elapsed), data
 
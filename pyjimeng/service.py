@@ -1,20 +1,30 @@
 from __future__ import annotations
 
-import base64
 import random
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+from concurrent.futures import ThreadPoolExecutor
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import requests
 
 from . import core
 from .errors import JimengAPIError
-from .images import generate_image_composition, generate_images
+from .images import generate_image_composition, generate_images, generate_images_batch
 from .logging import get_logger
 from .videos import generate_video as generate_video_api
-from .util import unix_timestamp
+from .util import stream_base64, unix_timestamp
 
 logger = get_logger()
 
+# CDN 结果下载共用的连接池：同主机多次取图/取视频复用 TCP+TLS 连接，
+# 热路径省掉整个握手；不做传输层重试，失败直接上抛给调用方。
+_HTTP = requests.Session()
+_http_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=10, pool_maxsize=20, max_retries=0
+)
+_HTTP.mount("https://", _http_adapter)
+_HTTP.mount("http://", _http_adapter)
+
 
 class JimengClient:
     """
@@ -31,6 +41,15 @@ class JimengClient:
             self._session_ids = [session_ids]
         else:
             self._session_ids = list(session_ids)
+        # 伴生集合提供 O(1) 成员判断；列表保持插入序供随机选取
+        self._session_set = set(self._session_ids)
+        # token -> (过期时刻, 积分)。由积分查询顺带填充，选取时按
+        # 余额加权；生成失败即失效对应条目，耗尽的 token 自然被冷落
+        self._credit_cache: Dict[str, Tuple[float, int]] = {}
+
+    def close(self) -> None:
+        """关闭底层 HTTP 连接池，释放空闲 socket。"""
+        core.close_session()
 
     # ------------------------------------------------------------------ #
     # Session helpers
@@ -44,17 +63,41 @@ class JimengClient:
             self._session_ids = [session_ids]
         else:
             self._session_ids = list(session_ids)
+        self._session_set = set(self._session_ids)
 
     def add_session_id(self, session_id: str) -> None:
-        if session_id not in self._session_ids:
+        if session_id not in self._session_set:
+            self._session_set.add(session_id)
             self._session_ids.append(session_id)
 
     def remove_session_id(self, session_id: str) -> None:
-        if session_id in self._session_ids:
+        if session_id in self._session_set:
+            self._session_set.discard(session_id)
             self._session_ids.remove(session_id)
 
     def clear_session_ids(self) -> None:
         self._session_ids.clear()
+        self._session_set.clear()
+
+    CREDIT_WEIGHT_TTL = 60.0
+
+    def _note_credits(self, token: str, points: Dict[str, Any]) -> None:
+        total = points.get("totalCredit")
+        if isinstance(total, int):
+            self._credit_cache[token] = (
+                time.monotonic() + self.CREDIT_WEIGHT_TTL,
+                total,
+            )
+
+    def _drop_credit(self, token: str) -> None:
+        self._credit_cache.pop(token, None)
+        core.invalidate_credit(token)
+
+    def _note_generation(self, token: str) -> None:
+        # 生成扣了积分：core 层的 30s 积分缓存立即过时，必须失效，
+        # 否则后续的余额查询与下一次生成前的领分判断都会拿到旧值；
+        # 本地权重条目保留，下次查分会以新值覆盖
+        core.invalidate_credit(token)
 
     def _choose_token(self, override: Optional[Union[str, Sequence[str]]] = None) -> str:
         if override:
@@ -63,7 +106,17 @@ class JimengClient:
             tokens = self._session_ids
         if not tokens:
             raise JimengAPIError("未提供 session_id")
-        return random.choice(tokens)
+        if len(tokens) == 1:
+            return tokens[0]
+        # 按已知余额加权随机：余额高的 session 被选中概率更高，未知或
+        # 过期条目按权重 1 参与，不为选取本身发起网络请求
+        now = time.monotonic()
+        weights = []
+        for token in tokens:
+            cached = self._credit_cache.get(token)
+            weight = cached[1] if cached and cached[0] > now else 1
+            weights.append(max(1, weight))
+        return random.choices(tokens, weights=weights, k=1)[0]
 
     # ------------------------------------------------------------------ #
     # Core APIs
@@ -80,11 +133,19 @@ class JimengClient:
         )
         if not tokens:
             raise JimengAPIError("未提供 session_id")
-        results = []
-        for token in tokens:
-            points = core.get_credit(token)
-            results.append({"token": token, "points": points})
-        return results
+        if len(tokens) == 1:
+            points = core.get_credit(tokens[0])
+            self._note_credits(tokens[0], points)
+            return [{"token": tokens[0], "points": points}]
+        # 多 token 并行查询：总耗时约等于最慢的一条，而非逐条相加
+        with ThreadPoolExecutor(max_workers=min(16, len(tokens))) as pool:
+            points_list = list(pool.map(core.get_credit, tokens))
+        for token, points in zip(tokens, points_list):
+            self._note_credits(token, points)
+        return [
+            {"token": token, "points": points}
+            for token, points in zip(tokens, points_list)
+        ]
 
     def generate_image(
         self,
@@ -99,18 +160,60 @@ class JimengClient:
         response_format: str = "url",
     ) -> Dict[str, Any]:
         token = self._choose_token(session_id)
-        urls = generate_images(
-            model,
-            prompt,
-            refresh_token=token,
-            ratio=ratio,
-            resolution=resolution,
-            sample_strength=sample_strength,
-            negative_prompt=negative_prompt or "",
-        )
+        try:
+            urls = generate_images(
+                model,
+                prompt,
+                refresh_token=token,
+                ratio=ratio,
+                resolution=resolution,
+                sample_strength=sample_strength,
+                negative_prompt=negative_prompt or "",
+            )
+        except JimengAPIError:
+            # 失败多半意味着积分耗尽或 session 失效，清掉权重条目
+            self._drop_credit(token)
+            raise
+        self._note_generation(token)
         data = self._format_response(urls, response_format)
         return {"created": unix_timestamp(), "data": data}
 
+    def generate_images_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        session_id: Optional[Union[str, Sequence[str]]] = None,
+        model: str = "jimeng-4.0",
+        ratio: str = "1:1",
+        resolution: str = "2k",
+        negative_prompt: Optional[str] = None,
+        sample_strength: float = 0.5,
+        response_formats: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """批量文生图：共享一次积分检查，先全部提交再逐个等待。"""
+        token = self._choose_token(session_id)
+        try:
+            url_groups = generate_images_batch(
+                model,
+                list(prompts),
+                refresh_token=token,
+                ratio=ratio,
+                resolution=resolution,
+                sample_strength=sample_strength,
+                negative_prompt=negative_prompt or "",
+            )
+        except JimengAPIError:
+            self._drop_credit(token)
+            raise
+        self._note_generation(token)
+        formats = list(response_formats or [])
+        results = []
+        for idx, urls in enumerate(url_groups):
+            response_format = formats[idx] if idx < len(formats) else "url"
+            data = self._format_response(urls, response_format)
+            results.append({"created": unix_timestamp(), "data": data})
+        return results
+
     def image_composition(
         self,
         prompt: str,
@@ -125,16 +228,21 @@ class JimengClient:
         response_format: str = "url",
     ) -> Dict[str, Any]:
         token = self._choose_token(session_id)
-        urls = generate_image_composition(
-            model,
-            prompt,
-            images,
-            refresh_token=token,
-            ratio=ratio,
-            resolution=resolution,
-            sample_strength=sample_strength,
-            negative_prompt=negative_prompt or "",
-        )
+        try:
+            urls = generate_image_composition(
+                model,
+                prompt,
+                images,
+                refresh_token=token,
+                ratio=ratio,
+                resolution=resolution,
+                sample_strength=sample_strength,
+                negative_prompt=negative_prompt or "",
+            )
+        except JimengAPIError:
+            self._drop_credit(token)
+            raise
+        self._note_generation(token)
         data = self._format_response(urls, response_format)
         return {
             "created": unix_timestamp(),
@@ -155,22 +263,25 @@ class JimengClient:
         response_format: str = "url",
     ) -> Dict[str, Any]:
         token = self._choose_token(session_id)
-        video_url = generate_video_api(
-            model,
-            prompt,
-            refresh_token=token,
-            width=width,
-            height=height,
-            resolution=resolution,
-        )
+        try:
+            video_url = generate_video_api(
+                model,
+                prompt,
+                refresh_token=token,
+                width=width,
+                height=height,
+                resolution=resolution,
+            )
+        except JimengAPIError:
+            self._drop_credit(token)
+            raise
+        self._note_generation(token)
         if response_format == "b64_json":
-            response = requests.get(video_url, timeout=300)
-            response.raise_for_status()
-            data = [
-                {
-                    "b64_json": base64.b64encode(response.content).decode("ascii"),
-                }
-            ]
+            # 视频动辄数十 MB，整体读入再编码会让原始字节与 Base64
+            # 结果同时驻留；按块流式编码把峰值内存压到编码结果本身
+            with _HTTP.get(video_url, timeout=300, stream=True) as response:
+                response.raise_for_status()
+                data = [{"b64_json": stream_base64(response)}]
         else:
             data = [{"url": video_url}]
         return {"created": unix_timestamp(), "data": data}
@@ -178,13 +289,18 @@ class JimengClient:
     # ------------------------------------------------------------------ #
     # Helper
     # ------------------------------------------------------------------ #
+    @staticmethod
+    def _fetch_b64(url: str) -> Dict[str, Any]:
+        with _HTTP.get(url, timeout=60, stream=True) as response:
+            response.raise_for_status()
+            return {"b64_json": stream_base64(response)}
+
     def _format_response(self, urls: Sequence[str], response_format: str) -> List[Dict[str, Any]]:
         if response_format == "b64_json":
-            items = []
-            for url in urls:
-                content = requests.get(url, timeout=60)
-                content.raise_for_status()
-                b64 = base64.b64encode(content.content).decode("ascii")
-                items.append({"b64_json": b64})
-            return items
+            if len(urls) == 1:
+                return [self._fetch_b64(urls[0])]
+            # 多张结果图的 CDN 下载互相独立，并行取回后整体耗时约等于
+            # 最慢的一张；executor.map 保持与 urls 相同的顺序
+            with ThreadPoolExecutor(max_workers=min(8, len(urls))) as pool:
+                return list(pool.map(self._fetch_b64, urls))
         return [{"url": url} for url in urls]
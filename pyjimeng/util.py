@@ -2,17 +2,63 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import itertools
+import json
+import os
 import random
 import time
-import uuid
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from typing import Any, Iterable, Optional, Union
 
 import requests
 
+try:  # orjson（C 实现）可用时优先，大响应解析快 3~5 倍
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - 可选依赖
+    _orjson = None
+
+
+def json_loads(payload: Union[str, bytes]) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(payload)
+    return json.loads(payload)
+
+
+def json_dumps(obj: Any) -> bytes:
+    if _orjson is not None:
+        return _orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# uuid4() 每次单独进一趟 urandom；生成提交的草稿一次要十来个 ID，
+# 批量取 16*32 字节随机数后切片，系统调用摊薄到 1/32。单独的 pop
+# 虽原子，但"判空再 pop"两步之间可能被并发掏空，故失败后补池重试。
+# （不改用 random.getrandbits 造 ID：梅森旋转状态在 fork 后两个
+# 进程完全相同，会成对产出碰撞的"UUID"；批量 urandom 已把系统调用
+# 摊到可忽略，没必要为省它引入这种隐患。）
+_UUID_POOL: list[str] = []
+_UUID_POOL_SIZE = 32
+
+
+def _format_uuid4(chunk: bytes) -> str:
+    # 绕开 UUID 对象的构造与 __str__：手工置版本/变体位后直接 hex
+    raw = bytearray(chunk)
+    raw[6] = (raw[6] & 0x0F) | 0x40
+    raw[8] = (raw[8] & 0x3F) | 0x80
+    h = bytes(raw).hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
 
 def uuid_str(with_hyphen: bool = True) -> str:
-    value = str(uuid.uuid4())
+    while True:
+        try:
+            value = _UUID_POOL.pop()
+            break
+        except IndexError:
+            raw = os.urandom(16 * _UUID_POOL_SIZE)
+            _UUID_POOL.extend(
+                _format_uuid4(raw[i : i + 16]) for i in range(0, len(raw), 16)
+            )
     return value if with_hyphen else value.replace("-", "")
 
 
@@ -21,21 +67,69 @@ def unix_timestamp() -> int:
 
 
 def timestamp_ms() -> int:
-    return int(time.time() * 1000)
+    # 纯整数路径：不经过 float 乘法，也没有浮点精度截断
+    return time.time_ns() // 1_000_000
 
 
 def md5(text: str) -> str:
-    return hashlib.md5(text.encode("utf-8")).hexdigest()
+    # 仅作指纹而非安全哈希；算法名即契约，不能换 blake2b 之类
+    return hashlib.md5(text.encode("utf-8"), usedforsecurity=False).hexdigest()
 
 
 def random_fingerprint() -> int:
-    return random.randint(7_000_000_000_000_000_000, 9_000_000_000_000_000_000)
+    # getrandbits+取模比 randint 的拒绝采样快数倍；指纹只求落在区间
+    return 7_000_000_000_000_000_000 + random.getrandbits(62) % 2_000_000_000_000_000_001
+
+
+def _iter_base64_chunks(response: requests.Response, chunk_size: int):
+    """按 3 字节对齐分块编码响应流，拼接结果与一次性编码一致。"""
+    pending = b""
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if not chunk:
+            continue
+        pending += chunk
+        usable = len(pending) - (len(pending) % 3)
+        if usable:
+            yield base64.b64encode(pending[:usable])
+            pending = pending[usable:]
+    if pending:
+        yield base64.b64encode(pending)
+
+
+def stream_base64(response: requests.Response, chunk_size: int = 3 * 65536) -> str:
+    """
+    流式读取响应并分块 Base64 编码，避免原始字节与编码结果同时驻留内存。
+    """
+    return b"".join(_iter_base64_chunks(response, chunk_size)).decode("ascii")
+
+
+def stream_base64_bytes(response: requests.Response, chunk_size: int = 3 * 65536) -> bytes:
+    """同 stream_base64，但保持 ASCII 字节串不解码——交给 orjson 等
+    接受 bytes 的序列化器时省掉一次整段 decode/encode 往返。"""
+    return b"".join(_iter_base64_chunks(response, chunk_size))
+
+
+def drain_response(response: requests.Response, chunk_size: int = 65536) -> bytes:
+    """按 64KiB 块读空流式响应，bytearray 累积避免 bytes += 的平方拷贝。"""
+    buffer = bytearray()
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if chunk:
+            buffer.extend(chunk)
+    return bytes(buffer)
 
 
 def fetch_file_base64(url: str) -> str:
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    return base64.b64encode(response.content).decode("ascii")
+    # 流式取回并走 stream_base64 增量编码：原始字节不整体落地，
+    # 峰值内存从「原始+编码」两份降到编码结果一份
+    with requests.get(url, timeout=30, stream=True) as response:
+        response.raise_for_status()
+        return stream_base64(response)
+
+
+def fetch_file_base64_bytes(url: str) -> bytes:
+    with requests.get(url, timeout=30, stream=True) as response:
+        response.raise_for_status()
+        return stream_base64_bytes(response)
 
 
 def is_base64_data(payload: str) -> bool:
@@ -43,19 +137,18 @@ def is_base64_data(payload: str) -> bool:
 
 
 def normalize_base64(payload: str) -> str:
+    # find+切片只分配数据部分一个子串；split 还要为丢弃的前缀建串
     if payload.startswith("data:"):
-        return payload.split(",", 1)[1]
+        i = payload.find(",", 5)
+        if i != -1:
+            return payload[i + 1 :]
     return payload
 
 
 def chunk_list(items: Iterable, size: int):
-    chunk = []
-    for item in items:
-        chunk.append(item)
-        if len(chunk) >= size:
-            yield chunk
-            chunk = []
-    if chunk:
+    # islice 在 C 层一次取整块，免去逐元素 append 与长度判断
+    it = iter(items)
+    while chunk := list(itertools.islice(it, size)):
         yield chunk
 
 
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import json
 import math
 import random
 import time
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 from . import constants
@@ -11,17 +11,69 @@ from .core import get_credit, receive_credit, request
 from .errors import JimengAPIError
 from .logging import get_logger
 from .poller import PollingStatus, SmartPoller
-from .util import uuid_str
+from .util import json_dumps, timestamp_ms, uuid_str
 
 logger = get_logger()
 
 
+# 映射表与默认项在导入时绑定为本地名，省掉每次调用对 constants
+# 模块的两级属性解析与默认键回查
+_VIDEO_MODEL_MAP = constants.VIDEO_MODEL_MAP
+_DEFAULT_VIDEO_MODEL = _VIDEO_MODEL_MAP[constants.DEFAULT_VIDEO_MODEL]
+
+
 def _map_model(name: str) -> str:
-    mapping = constants.VIDEO_MODEL_MAP
-    return mapping.get(name, mapping[constants.DEFAULT_VIDEO_MODEL])
+    return _VIDEO_MODEL_MAP.get(name, _DEFAULT_VIDEO_MODEL)
+
+
+# 每个模型实际完成耗时的指数滑动平均：首轮查询前先睡到历史均值的
+# 八成处，跳过前期必然落空的轮询；其后改用 2s 的密集节奏收尾
+_MODEL_ETA: Dict[str, float] = {}
+_DEFAULT_VIDEO_ETA = 30.0
+# 预等待封顶：EMA 异常走高（偶发慢任务）时，下一条请求至多盲等 45s
+_FIRST_WAIT_CAP = 45.0
+
+
+# 计费信息与 http_common_info 全为常量，extend 只随映射后的模型
+# 变化；共享只读实例嵌入 payload，提交路径不再重建这批小字典
+_COMMERCE_INFO = {
+    "benefit_type": "basic_video_operation_vgfm_v_three",
+    "resource_id": "generate_video",
+    "resource_id_type": "str",
+    "resource_sub_type": "aigc",
+}
+_HTTP_COMMON = {"aid": int(constants.DEFAULT_ASSISTANT_ID_CN)}
+
+
+# draft_content 的骨架全是常量，动态的只有若干 ID、时间戳与两段
+# 子文档（生成参数、埋点串）；骨架在导入时渲染成 %-模板，每次提交
+# 只编码动态子树，序列化工作量缩到原来的一小部分。ID 是 UUID、
+# 时间戳是整数，均无需转义；两段子文档经 json_dumps 自带转义。
+_DRAFT_TEMPLATE = (
+    '{"type":"draft","id":"%s","min_version":"3.0.5","is_from_tsn":true,'
+    '"version":"' + constants.DRAFT_VERSION + '","main_component_id":"%s",'
+    '"component_list":[{"type":"video_base_component","id":"%s",'
+    '"min_version":"1.0.0","metadata":{"type":"","id":"%s",'
+    '"created_platform":3,"created_platform_version":"",'
+    '"created_time_in_ms":%d,"created_did":""},'
+    '"generate_type":"gen_video","aigc_mode":"workbench",'
+    '"abilities":{"type":"","id":"%s","gen_video":{"id":"%s","type":"",'
+    '"text_to_video_params":%s,"video_task_extra":%s}}}]}'
+).__mod__
+
+
+@lru_cache(maxsize=8)
+def _video_extend(model: str) -> Dict[str, object]:
+    return {
+        "root_model": model,
+        "m_video_commerce_info": _COMMERCE_INFO,
+        "m_video_commerce_info_list": [_COMMERCE_INFO],
+    }
 
 
+@lru_cache(maxsize=64)
 def _aspect_ratio(width: int, height: int) -> str:
+    # 实际只会出现少数几种分辨率组合，缓存掉 gcd 与字符串格式化
     gcd = math.gcd(width, height)
     return f"{width // gcd}:{height // gcd}"
 
@@ -35,8 +87,8 @@ def _build_text_to_video_payload(
     resolution: str,
 ) -> Dict[str, object]:
     component_id = uuid_str()
-    now_ms = int(time.time() * 1000)
-    metrics_extra = json.dumps(
+    now_ms = timestamp_ms()
+    metrics_extra = json_dumps(
         {
             "enterFrom": "click",
             "isDefaultSeed": 1,
@@ -44,14 +96,15 @@ def _build_text_to_video_payload(
             "isRegenerate": False,
             "originSubmitId": uuid_str(),
         }
-    )
+    ).decode("utf-8")
 
     text_to_video_params = {
         "type": "",
         "id": uuid_str(),
         "model_req_key": model,
         "priority": 0,
-        "seed": random.randint(2_500_000_000, 2_600_000_000),
+        # 取模替代 randint 的 _randbelow 往返；种子只需落在区间内
+        "seed": 2_500_000_000 + random.getrandbits(27) % 100_000_001,
         "video_aspect_ratio": _aspect_ratio(width, height),
         "video_gen_inputs": [
             {
@@ -69,66 +122,26 @@ def _build_text_to_video_payload(
         ],
     }
 
-    draft_content = {
-        "type": "draft",
-        "id": uuid_str(),
-        "min_version": "3.0.5",
-        "is_from_tsn": True,
-        "version": constants.DRAFT_VERSION,
-        "main_component_id": component_id,
-        "component_list": [
-            {
-                "type": "video_base_component",
-                "id": component_id,
-                "min_version": "1.0.0",
-                "metadata": {
-                    "type": "",
-                    "id": uuid_str(),
-                    "created_platform": 3,
-                    "created_platform_version": "",
-                    "created_time_in_ms": now_ms,
-                    "created_did": "",
-                },
-                "generate_type": "gen_video",
-                "aigc_mode": "workbench",
-                "abilities": {
-                    "type": "",
-                    "id": uuid_str(),
-                    "gen_video": {
-                        "id": uuid_str(),
-                        "type": "",
-                        "text_to_video_params": text_to_video_params,
-                        "video_task_extra": metrics_extra,
-                    },
-                },
-            }
-        ],
-    }
+    draft_content = _DRAFT_TEMPLATE(
+        (
+            uuid_str(),
+            component_id,
+            component_id,
+            uuid_str(),
+            now_ms,
+            uuid_str(),
+            uuid_str(),
+            json_dumps(text_to_video_params).decode("utf-8"),
+            json_dumps(metrics_extra).decode("utf-8"),
+        )
+    )
 
     return {
-        "extend": {
-            "root_model": model,
-            "m_video_commerce_info": {
-                "benefit_type": "basic_video_operation_vgfm_v_three",
-                "resource_id": "generate_video",
-                "resource_id_type": "str",
-                "resource_sub_type": "aigc",
-            },
-            "m_video_commerce_info_list": [
-                {
-                    "benefit_type": "basic_video_operation_vgfm_v_three",
-                    "resource_id": "generate_video",
-                    "resource_id_type": "str",
-                    "resource_sub_type": "aigc",
-                }
-            ],
-        },
+        "extend": _video_extend(model),
         "submit_id": uuid_str(),
         "metrics_extra": metrics_extra,
-        "draft_content": json.dumps(draft_content),
-        "http_common_info": {
-            "aid": int(constants.DEFAULT_ASSISTANT_ID_CN),
-        },
+        "draft_content": draft_content,
+        "http_common_info": _HTTP_COMMON,
     }
 
 
@@ -136,14 +149,17 @@ def _poll_video_status(history_id: str, refresh_token: str) -> Tuple[PollingStat
     payload = {"history_ids": [history_id]}
     history = request("POST", "/mweb/v1/get_history_by_ids", refresh_token, json=payload)
 
-    info: Optional[Dict[str, object]] = None
-    if isinstance(history, dict):
+    # 热路径单次尝试取出记录；畸形响应（非 dict、缺键、空列表）
+    # 走异常分支，正常轮询每轮不再逐层 isinstance 探查
+    try:
         if history_id in history:
             info = history[history_id]
-        elif "history_list" in history and history["history_list"]:
-            info = history["history_list"][0]
-        elif "history_records" in history and history["history_records"]:
-            info = history["history_records"][0]
+        else:
+            info = (
+                history.get("history_list") or history.get("history_records")
+            )[0]
+    except (TypeError, KeyError, IndexError, AttributeError):
+        raise JimengAPIError("记录不存在") from None
 
     if not isinstance(info, dict):
         raise JimengAPIError("记录不存在")
@@ -166,15 +182,15 @@ def _extract_video_url(info: Dict[str, object]) -> Optional[str]:
     if not isinstance(video_info, dict):
         return None
 
-    candidates = [
-        (video_info.get("transcoded_video") or {}).get("origin", {}).get("video_url")
-        if isinstance(video_info.get("transcoded_video"), dict)
-        else None,
-        video_info.get("play_url"),
-        video_info.get("download_url"),
-        video_info.get("url"),
-    ]
-    for url in candidates:
+    # 逐个候选短路返回：常规响应首选的转码地址命中后，后面三个
+    # 字段与整张候选列表都不再构建
+    transcoded = video_info.get("transcoded_video")
+    if isinstance(transcoded, dict):
+        url = (transcoded.get("origin") or {}).get("video_url")
+        if isinstance(url, str) and url.startswith("http"):
+            return url
+    for key in ("play_url", "download_url", "url"):
+        url = video_info.get(key)
         if isinstance(url, str) and url.startswith("http"):
             return url
     return None
@@ -210,6 +226,7 @@ def generate_video(
         "aigc_features": constants.AIGC_FEATURES,
     }
 
+    submit_ts = time.monotonic()
     response = request(
         "POST",
         "/mweb/v1/aigc_draft/generate",
@@ -225,16 +242,40 @@ def generate_video(
 
     poller = SmartPoller(
         expected_item_count=1,
-        poll_interval=3.0,
+        poll_interval=2.0,
         timeout_seconds=600.0,
         item_type="video",
     )
 
+    eta = _MODEL_ETA.get(model, _DEFAULT_VIDEO_ETA)
+    # 预等待挂在 stop_event 上：取消时立即醒来，交给轮询循环按
+    # 已取消路径收尾，而不是在不可中断的 sleep 里干耗
+    first_wait = min(eta * 0.8, _FIRST_WAIT_CAP)
+    if first_wait > 0:
+        poller.wait(first_wait)
+
     result, info = poller.poll(lambda: _poll_video_status(history_id, refresh_token), history_id=history_id)
 
     url = _extract_video_url(info)
     if not url:
         raise JimengAPIError("未能获取视频URL")
 
+    # EMA 样本优先取服务端任务起止时间——不受本地预等待的下限效应
+    # 影响；字段缺失或单位异常（毫秒级数值）时退回从提交起算的本地
+    # 时长，并以轮询超时为样本上限防止估计爆涨
+    task = info.get("task") if isinstance(info, dict) else None
+    sample = None
+    if isinstance(task, dict):
+        created = task.get("create_time")
+        finished = task.get("finish_time")
+        if (
+            isinstance(created, (int, float))
+            and isinstance(finished, (int, float))
+            and 0 < finished - created <= 600
+        ):
+            sample = float(finished - created)
+    if sample is None:
+        sample = min(time.monotonic() - submit_ts, 600.0)
+    _MODEL_ETA[model] = 0.7 * eta + 0.3 * sample
     logger.info("视频生成完成 url=%s status=%s", url, result.status)
     return url